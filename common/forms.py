@@ -9,35 +9,50 @@ from .models import SystemSetting ,Ticket
 User = get_user_model()
 
 
-class BootstrapModelForm(forms.ModelForm):
+def _widget_css_class(widget):
+    # Checkbox
+    if isinstance(widget, forms.CheckboxInput):
+        return "form-check-input"
+
+    # Selects (ChoiceField, ModelChoiceField, Multiple select, etc.)
+    if isinstance(widget, (forms.Select, forms.SelectMultiple)):
+        return "form-select"
+
+    # Everything else → form-control
+    return "form-control"
+
+
+class BootstrapFormMeta(forms.models.ModelFormMetaclass):
     """
-    Base form to automatically add Bootstrap classes to widgets.
-    - Text / number / email / URL / textarea / date => form-control
-    - Select / ModelChoiceField => form-select
-    - Checkbox => form-check-input
+    Adds the Bootstrap widget classes once, when the form class is built.
+    Instances get deep copies of base_fields, so the classes carry over
+    without touching every field on each instantiation.
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    def __new__(mcs, name, bases, attrs):
+        new_class = super().__new__(mcs, name, bases, attrs)
 
-        for name, field in self.fields.items():
+        for field in new_class.base_fields.values():
             widget = field.widget
 
-            # Keep any existing classes
-            existing_classes = widget.attrs.get("class", "")
+            css_class = _widget_css_class(widget)
 
-            # Checkbox
-            if isinstance(widget, forms.CheckboxInput):
-                widget.attrs["class"] = (existing_classes + " form-check-input").strip()
+            # Keep any existing classes; declared fields are shared with
+            # subclasses, so don't add the same class twice.
+            existing_classes = widget.attrs.get("class", "")
+            if css_class not in existing_classes.split():
+                widget.attrs["class"] = (existing_classes + " " + css_class).strip()
 
-            # Selects (ChoiceField, ModelChoiceField, etc.)
-            elif isinstance(widget, (forms.Select, forms.SelectMultiple)):
-                widget.attrs["class"] = (existing_classes + " form-select").strip()
+        return new_class
 
-            # Everything else → form-control
-            else:
-                widget.attrs["class"] = (existing_classes + " form-control").strip()
 
+class BootstrapModelForm(forms.ModelForm, metaclass=BootstrapFormMeta):
+    """
+    Base form to automatically add Bootstrap classes to widgets.
+    - Text / number / email / URL / textarea / date => form-control
+    - Select / ModelChoiceField / ModelMultipleChoiceField => form-select
+    - Checkbox => form-check-input
+    """
 
 
 class UserCreateForm(UserCreationForm):
@@ -0,0 +1,16 @@
+# common/management/commands/rebuild_monthly_metrics.py
+
+from django.core.management.base import BaseCommand
+
+from common.models import MonthlyMetric
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount MonthlyMetric from leads, clients and deals "
+        "(after bulk_create / QuerySet.update / raw SQL changes)."
+    )
+
+    def handle(self, *args, **options):
+        rows = MonthlyMetric.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} monthly metric rows."))
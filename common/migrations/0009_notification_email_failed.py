@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0008_ticket_ticket_number_alter_ticket_screenshot'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notif_type',
+            field=models.CharField(choices=[('project_assigned', 'Project assigned'), ('task_assigned', 'Task assigned'), ('overdue', 'Overdue'), ('deliverable_overdue', 'Deliverable overdue'), ('email_failed', 'Email failed')], help_text='Type/category of this notification.', max_length=32),
+        ),
+    ]
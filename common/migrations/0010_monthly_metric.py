@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0009_notification_email_failed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=100)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('owner', models.ForeignKey(blank=True, help_text='Owner of the counted records; empty for unowned records.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='monthly_metrics', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Monthly metric',
+                'verbose_name_plural': 'Monthly metrics',
+                'indexes': [models.Index(fields=['owner', 'model_name', 'year', 'month'], name='common_mont_owner_i_ab40d0_idx'), models.Index(fields=['model_name', 'year', 'month'], name='common_mont_model_n_c1d106_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model_name', 'owner', 'year', 'month'), name='uniq_monthly_metric')],
+            },
+        ),
+    ]
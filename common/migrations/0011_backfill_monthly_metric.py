@@ -0,0 +1,57 @@
+# Seed MonthlyMetric from the existing leads, clients and deals.
+
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+# (app_label, model_name) - kept in step with common/signals.py
+METRIC_MODELS = [
+    ("crm", "lead"),
+    ("crm", "client"),
+    ("sales", "deal"),
+]
+
+
+def backfill_monthly_metrics(apps, schema_editor):
+    """
+    One GROUP BY per model; months are taken in the project time zone,
+    the same way the signals bucket new records.
+    """
+    MonthlyMetric = apps.get_model("common", "MonthlyMetric")
+    MonthlyMetric.objects.all().delete()
+
+    rows = []
+    for app_label, model_name in METRIC_MODELS:
+        Model = apps.get_model(app_label, model_name)
+        grouped = (
+            Model.objects
+            .annotate(y=ExtractYear("created_at"), m=ExtractMonth("created_at"))
+            .values("owner_id", "y", "m")
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        rows.extend(
+            MonthlyMetric(
+                model_name=f"{app_label}.{model_name}",
+                owner_id=g["owner_id"],
+                year=g["y"],
+                month=g["m"],
+                count=g["n"],
+            )
+            for g in grouped
+        )
+    MonthlyMetric.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0010_monthly_metric"),
+        ("crm", "0008_contact_allow_marketing"),
+        ("sales", "0016_list_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_monthly_metrics, migrations.RunPython.noop),
+    ]
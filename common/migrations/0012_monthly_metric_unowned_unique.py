@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-16 09:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_unowned_duplicates(apps, schema_editor):
+    """
+    Unowned rows could repeat a month before this constraint; keep one row
+    per (model_name, year, month) holding the summed count.
+    """
+    MonthlyMetric = apps.get_model("common", "MonthlyMetric")
+    dupes = (
+        MonthlyMetric.objects.filter(owner__isnull=True)
+        .values("model_name", "year", "month")
+        .annotate(n=Count("pk"), keep=Min("pk"), total=Sum("count"))
+        .filter(n__gt=1)
+        .order_by()
+    )
+    for d in dupes:
+        group = MonthlyMetric.objects.filter(
+            owner__isnull=True, model_name=d["model_name"], year=d["year"], month=d["month"]
+        )
+        group.exclude(pk=d["keep"]).delete()
+        group.filter(pk=d["keep"]).update(count=d["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0011_backfill_monthly_metric'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_unowned_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='monthlymetric',
+            constraint=models.UniqueConstraint(condition=models.Q(('owner__isnull', True)), fields=('model_name', 'year', 'month'), name='uniq_monthly_metric_unowned'),
+        ),
+    ]
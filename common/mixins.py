@@ -37,3 +37,41 @@ class StaffAllMixin(RolesRequiredMixin):
     allowed_roles = [ROLE_ADMIN, ROLE_MANAGER, ROLE_EMPLOYEE]
 
 
+
+
+class ListFiltersMixin:
+    """
+    Reads a list view's GET filters once per request into self._filters
+    (stripped strings, "" when absent), shared by get_queryset and
+    get_context_data. Subclass and set filter_params.
+    """
+    filter_params = ()
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self._filters = {
+            key: (request.GET.get(key) or "").strip() for key in self.filter_params
+        }
+
+
+class CachedSuccessUrlMixin:
+    """
+    Resolves a static success_url (usually a reverse_lazy) once per view
+    class instead of walking the URL resolver on every successful POST.
+    success_url templates like "/x/{id}/" and views without a success_url
+    keep Django's default behaviour.
+    """
+
+    @classmethod
+    def _resolved_success_url(cls):
+        # cls.__dict__, so a subclass never reuses its parent's URL
+        url = cls.__dict__.get("_success_url_cache")
+        if url is None:
+            url = str(cls.success_url)
+            cls._success_url_cache = url
+        return url
+
+    def get_success_url(self):
+        if not self.success_url or "{" in str(self.success_url):
+            return super().get_success_url()
+        return type(self)._resolved_success_url()
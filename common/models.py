@@ -1,7 +1,10 @@
 # common/models.py
 
+from django.apps import apps
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import ExtractMonth, ExtractYear
 from django.utils import timezone
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -62,6 +65,21 @@ class Owned(models.Model):
         abstract = True
 
 
+class MetricOwnerMixin:
+    """
+    Remembers the owner a row was loaded with, so common.signals can move
+    its MonthlyMetric count on an owner change without re-reading the row.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Deferred owner (e.g. .only("id")) -> pre_save falls back to a query
+        if "owner_id" in instance.__dict__:
+            instance._loaded_owner_id = instance.owner_id
+        return instance
+
+
 # ----------------------------------------------------------------------
 # GENERIC CHOICE TABLE
 # ----------------------------------------------------------------------
@@ -315,6 +333,7 @@ class Notification(models.Model):
         TASK_ASSIGNED = "task_assigned", "Task assigned"
         OVERDUE = "overdue", "Overdue"
         DELIVERABLE_OVERDUE = "deliverable_overdue", "Deliverable overdue"
+        EMAIL_FAILED = "email_failed", "Email failed"
 
     recipient = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -373,6 +392,136 @@ class Notification(models.Model):
             return self.target.get_absolute_url()
         return "#"
 
+# ----------------------------------------------------------------------
+# MONTHLY METRICS (dashboard counters)
+# ----------------------------------------------------------------------
+
+
+class MonthlyMetric(models.Model):
+    """
+    Running count of records created per owner per (local) calendar month,
+    e.g. how many leads a manager created in March.
+
+    Kept up to date by common.signals for leads, clients and deals, so the
+    dashboard reads a handful of rows instead of counting those tables.
+    model_name is the model's label_lower, e.g. "crm.lead".
+
+    Only per-object save() / delete() (including QuerySet.delete()) reach
+    the signals. bulk_create(), QuerySet.update() of owner or created_at,
+    and raw SQL bypass them; run `manage.py rebuild_monthly_metrics` after
+    such changes.
+    """
+
+    TRACKED_MODELS = ("crm.lead", "crm.client", "sales.deal")
+
+    model_name = models.CharField(max_length=100)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="monthly_metrics",
+        help_text="Owner of the counted records; empty for unowned records.",
+    )
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["model_name", "owner", "year", "month"],
+                name="uniq_monthly_metric",
+            ),
+            # NULLs never collide above, so unowned rows need their own index
+            models.UniqueConstraint(
+                fields=["model_name", "year", "month"],
+                condition=models.Q(owner__isnull=True),
+                name="uniq_monthly_metric_unowned",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["owner", "model_name", "year", "month"]),
+            models.Index(fields=["model_name", "year", "month"]),
+        ]
+        verbose_name = "Monthly metric"
+        verbose_name_plural = "Monthly metrics"
+
+    def __str__(self):
+        return f"{self.model_name} {self.year}-{self.month:02d} ({self.owner_id}): {self.count}"
+
+    @classmethod
+    def bump(cls, model_name, owner_id, when, delta=1):
+        """
+        Add `delta` to the counter for `when`'s local month, creating the
+        row on first use. The increment is a single UPDATE ... SET
+        count = count + delta, so concurrent saves don't lose counts.
+        """
+        when = timezone.localtime(when)
+        cls._add(
+            {
+                "model_name": model_name,
+                "owner_id": owner_id,
+                "year": when.year,
+                "month": when.month,
+            },
+            delta,
+        )
+
+    @classmethod
+    def _add(cls, key, delta):
+        rows = cls.objects.filter(**key)
+        with transaction.atomic():
+            if rows.update(count=F("count") + delta):
+                return
+            try:
+                with transaction.atomic():
+                    cls.objects.create(count=delta, **key)
+            except IntegrityError:
+                # another request created the row first
+                rows.update(count=F("count") + delta)
+
+    @classmethod
+    def fold_owner(cls, owner_id):
+        """
+        Move a user's counters onto the unowned rows. Called before the
+        user is deleted, so SET_NULL never makes two rows for one month.
+        """
+        with transaction.atomic():
+            owned = cls.objects.filter(owner_id=owner_id)
+            for model_name, year, month, count in owned.values_list(
+                "model_name", "year", "month", "count"
+            ):
+                key = {"model_name": model_name, "owner_id": None, "year": year, "month": month}
+                cls._add(key, count)
+            owned.delete()
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recount every tracked model from scratch: one GROUP BY per model,
+        months taken in the current time zone like bump().
+        """
+        rows = []
+        for label in cls.TRACKED_MODELS:
+            model = apps.get_model(label)
+            grouped = (
+                model.objects
+                .annotate(y=ExtractYear("created_at"), m=ExtractMonth("created_at"))
+                .values("owner_id", "y", "m")
+                .annotate(n=Count("pk"))
+                .order_by()
+            )
+            rows.extend(
+                cls(model_name=label, owner_id=g["owner_id"], year=g["y"], month=g["m"], count=g["n"])
+                for g in grouped
+            )
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(rows, batch_size=500)
+        return len(rows)
+
+
 # ----------------------------------------------------------------------
 # SUPPORT TICKET SYSTEM
 # ----------------------------------------------------------------------
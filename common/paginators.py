@@ -0,0 +1,119 @@
+# common/paginators.py
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class FastPage(Page):
+    """
+    Page that knows whether a next page exists without the total count.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        if not self._has_next:
+            raise EmptyPage("That page contains no results")
+        return self.number + 1
+
+    def previous_page_number(self):
+        if self.number <= 1:
+            raise EmptyPage("That page number is less than 1")
+        return self.number - 1
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.paginator.per_page + 1
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class FastPaginator(Paginator):
+    """
+    Paginator for Previous/Next navigation that never runs SELECT COUNT(*):
+    each page fetches per_page + 1 rows and uses the extra one to tell
+    whether a next page exists. `count` / `num_pages` still work, but
+    accessing them runs the COUNT - templates should only use
+    page_obj.has_next / has_previous / number.
+    """
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and (number > 1 or not self.allow_empty_first_page):
+            raise EmptyPage("That page contains no results")
+        has_next = len(rows) > self.per_page
+        return FastPage(rows[: self.per_page], number, self, has_next)
+
+
+class EstimatingPaginator(Paginator):
+    """
+    Regular page-numbered Paginator with a cheaper `count`:
+    - unfiltered list on PostgreSQL: the planner's row estimate from
+      pg_class.reltuples, once the table is big enough that an exact
+      COUNT(*) matters (small tables still get the exact count);
+    - filtered list: the exact COUNT(*), cached briefly per SQL + params,
+      so paging through the same search doesn't recount every page.
+    The estimate follows ANALYZE, so num_pages may be slightly off on a
+    large table - fine for a list UI.
+    """
+
+    ESTIMATE_THRESHOLD = 10_000
+    COUNT_CACHE_TIMEOUT = 30  # seconds
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is None:
+            return super().count
+
+        if not query.where:
+            estimate = self._estimated_count()
+            if estimate is not None and estimate >= self.ESTIMATE_THRESHOLD:
+                return estimate
+            return self.object_list.count()
+
+        sql, params = query.sql_with_params()
+        digest = hashlib.md5(f"{sql}|{params!r}".encode()).hexdigest()
+        return cache.get_or_set(
+            f"paginator:count:{self.object_list.db}:{digest}",
+            self.object_list.count,
+            self.COUNT_CACHE_TIMEOUT,
+        )
+
+    def _estimated_count(self):
+        connection = connections[self.object_list.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [self.object_list.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # -1 (or 0) until the table has been vacuumed/analyzed
+        if not row or row[0] <= 0:
+            return None
+        return row[0]
@@ -7,6 +7,25 @@ ROLE_EMPLOYEE = "Employee"
 
 ROLE_ALL = [ROLE_ADMIN, ROLE_MANAGER, ROLE_EMPLOYEE]
 
+
+def user_roles(user) -> frozenset:
+    """
+    Returns the user's role (group) names as a frozenset.
+    Superusers get every role. The lookup runs at most once per user object
+    and is cached on it as user._cached_roles.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    roles = getattr(user, "_cached_roles", None)
+    if roles is None:
+        if user.is_superuser:
+            roles = frozenset(ROLE_ALL)
+        else:
+            roles = frozenset(user.groups.values_list("name", flat=True))
+        user._cached_roles = roles
+    return roles
+
+
 def user_has_role(user, *roles):
     """
     Returns True if user is in ANY of the given roles.
@@ -16,4 +35,4 @@ def user_has_role(user, *roles):
         return False
     if user.is_superuser:
         return True
-    return user.groups.filter(name__in=roles).exists()
\ No newline at end of file
+    return not user_roles(user).isdisjoint(roles)
@@ -0,0 +1,74 @@
+# common/signals.py
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import MonthlyMetric
+
+# Monthly creation counts (by created_at and owner) are kept for
+# crm.Lead, crm.Client and sales.Deal; see MonthlyMetric.
+
+
+def _saves_owner(update_fields):
+    return update_fields is None or bool({"owner", "owner_id"} & set(update_fields))
+
+
+@receiver(pre_save, sender="crm.Lead")
+@receiver(pre_save, sender="crm.Client")
+@receiver(pre_save, sender="sales.Deal")
+def remember_metric_owner(sender, instance, update_fields=None, **kwargs):
+    """
+    Views fill in a missing owner on update, which moves the record to
+    another owner's counter. The loaded owner comes from
+    MetricOwnerMixin.from_db; only an instance loaded without its owner
+    column needs the stored value read here.
+    """
+    if instance._state.adding or instance.pk is None:
+        return
+    if "_loaded_owner_id" in instance.__dict__ or not _saves_owner(update_fields):
+        return
+    instance._loaded_owner_id = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("owner_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender="crm.Lead")
+@receiver(post_save, sender="crm.Client")
+@receiver(post_save, sender="sales.Deal")
+def count_created(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    label = sender._meta.label_lower
+    if created:
+        MonthlyMetric.bump(label, instance.owner_id, instance.created_at)
+        instance._loaded_owner_id = instance.owner_id
+        return
+    if not _saves_owner(update_fields):
+        return
+
+    prev_owner_id = instance.__dict__.get("_loaded_owner_id", instance.owner_id)
+    if prev_owner_id != instance.owner_id:
+        MonthlyMetric.bump(label, prev_owner_id, instance.created_at, -1)
+        MonthlyMetric.bump(label, instance.owner_id, instance.created_at)
+    instance._loaded_owner_id = instance.owner_id
+
+
+@receiver(post_delete, sender="crm.Lead")
+@receiver(post_delete, sender="crm.Client")
+@receiver(post_delete, sender="sales.Deal")
+def count_deleted(sender, instance, **kwargs):
+    MonthlyMetric.bump(
+        sender._meta.label_lower, instance.owner_id, instance.created_at, -1
+    )
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def fold_deleted_owner(sender, instance, **kwargs):
+    """
+    The user's records become unowned (owner is SET_NULL); move their
+    counters the same way before the FK is nulled.
+    """
+    MonthlyMetric.fold_owner(instance.pk)
@@ -1 +1,15 @@
+# common/utils.py
 
+
+def search_pks(model, q, *fields):
+    """
+    pk subquery for "any of `fields` icontains `q`", built as a UNION of one
+    query per field instead of an OR across a join, so each branch can use
+    its own (trigram) index. Use as `qs.filter(pk__in=search_pks(...))` -
+    the outer queryset stays filterable/orderable/pageable.
+    """
+    branches = [
+        model.objects.filter(**{f"{field}__icontains": q}).order_by().values("pk")
+        for field in fields
+    ]
+    return branches[0].union(*branches[1:])
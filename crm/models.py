@@ -3,10 +3,10 @@ from django.conf import settings
 from django.db import models
 from django.db.models import Q, UniqueConstraint
 
-from common.models import TimeStamped, Owned  # assuming these exist in `common`
+from common.models import MetricOwnerMixin, TimeStamped, Owned  # assuming these exist in `common`
 
 
-class Client(TimeStamped, Owned):
+class Client(MetricOwnerMixin, TimeStamped, Owned):
     """
     Main paying customer (family or individual).
     Replaces 'Company' from generic CRM.
@@ -114,7 +114,7 @@ class Contact(TimeStamped, Owned):
         return f"{full_name} ({self.client})"
 
 
-class Lead(TimeStamped, Owned):
+class Lead(MetricOwnerMixin, TimeStamped, Owned):
     """
     Unqualified inquiry that may convert into a Client + Deal.
     """
@@ -1,10 +1,13 @@
 # messaging/utils.py
 from __future__ import annotations
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
 
 from django.conf import settings
+from django.db import connections, transaction
 from django.template import Context, Template
 from django.utils import timezone
 import boto3
@@ -15,6 +18,8 @@ import re
 
 EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
 
+logger = logging.getLogger(__name__)
+
 def parse_custom_list(raw: str):
     """
     Accepts lines like:
@@ -281,3 +286,28 @@ def send_templated_email(
         cc=cc,
         bcc=bcc,
     )
+
+
+# -----------------------------------------------------------------------------
+# Background sending (keeps the SES round-trip out of the request)
+# -----------------------------------------------------------------------------
+
+_background_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="email")
+
+
+def run_in_background(fn, *args, **kwargs):
+    """
+    Run fn(*args, **kwargs) on a worker thread once the current transaction
+    commits. Pass pks, not model instances: the thread has its own DB
+    connection and should re-fetch what it needs.
+    Jobs still queued when the process exits are lost.
+    """
+    def _run():
+        try:
+            fn(*args, **kwargs)
+        except Exception:
+            logger.exception("Background job %s failed", getattr(fn, "__name__", fn))
+        finally:
+            connections.close_all()
+
+    transaction.on_commit(lambda: _background_executor.submit(_run))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0008_contact_allow_marketing'),
+        ('events', '0007_anniversarywishlog'),
+        ('projects', '0012_delete_projectsnapshot'),
+        ('sales', '0016_list_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deliverable',
+            index=models.Index(fields=['assigned_to', 'status', 'due_date'], name='projects_de_assigne_ede3de_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deliverable',
+            index=models.Index(fields=['project', 'status', 'due_date'], name='projects_de_project_3db419_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['manager', 'status', 'due_date'], name='projects_pr_manager_71dacc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'status', 'due_date'], name='projects_ta_assigne_8cc5a5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status', 'due_date'], name='projects_ta_project_11a5c2_idx'),
+        ),
+    ]
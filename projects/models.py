@@ -137,6 +137,8 @@ class Project(TimeStamped, Owned):
             models.Index(fields=["status"]),
             models.Index(fields=["priority"]),
             models.Index(fields=["due_date"]),
+            # manager dashboard: my open projects by due date
+            models.Index(fields=["manager", "status", "due_date"]),
         ]
 
     def __str__(self) -> str:
@@ -333,6 +335,9 @@ class Task(TimeStamped, Owned):
             models.Index(fields=["status"]),
             models.Index(fields=["priority"]),
             models.Index(fields=["due_date"]),
+            # dashboards: assignee's / project's pending tasks by due date
+            models.Index(fields=["assigned_to", "status", "due_date"]),
+            models.Index(fields=["project", "status", "due_date"]),
         ]
 
     def __str__(self) -> str:
@@ -481,6 +486,9 @@ class Deliverable(TimeStamped, Owned):
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["due_date"]),
+            # dashboards: assignee's / project's pending deliverables by due date
+            models.Index(fields=["assigned_to", "status", "due_date"]),
+            models.Index(fields=["project", "status", "due_date"]),
         ]
 
     def __str__(self) -> str:
@@ -0,0 +1,131 @@
+# sales/emails.py
+"""
+Document emails (proposal / contract / invoice / payment) sent off the
+request thread. Views queue them with queue_document_email(); the worker
+re-fetches the document by pk, renders the default template and sends it.
+A failed send is reported to the requesting user as a notification.
+
+Jobs run on an in-process thread pool (messaging.utils.run_in_background),
+not a durable queue: one still pending when the worker restarts is lost,
+so the UI says "sending" rather than "queued".
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+
+from common.models import Notification
+from common.notifications import create_notification
+from messaging.models import EmailTemplate
+from messaging.utils import run_in_background, send_templated_email
+
+from .models import Proposal, Contract, Invoice, Payment
+
+
+def _proposal_email(pk):
+    proposal = Proposal.objects.select_related("deal", "deal__client").get(pk=pk)
+    deal = proposal.deal
+    return proposal, EmailTemplate.TemplateType.PROPOSAL, {
+        "proposal": proposal,
+        "deal": deal,
+        "client": deal.client if deal else None,
+    }
+
+
+def _contract_email(pk):
+    contract = Contract.objects.select_related("deal", "deal__client", "proposal").get(pk=pk)
+    deal = contract.deal
+    return contract, EmailTemplate.TemplateType.CONTRACT, {
+        "contract": contract,
+        "proposal": contract.proposal,
+        "deal": deal,
+        "client": deal.client if deal else None,
+    }
+
+
+def _invoice_email(pk):
+    # Invoice has no contract FK: the deal's latest contract is prefetched
+    # (1:n -> prefetch_related; FK/1:1 -> select_related)
+    invoice = (
+        Invoice.objects
+        .select_related("deal", "deal__client")
+        .prefetch_related(
+            Prefetch(
+                "deal__contracts",
+                queryset=Contract.objects.only(
+                    "id", "deal", "number", "status", "signed_date", "created_at",
+                ).order_by("-signed_date", "-created_at"),
+            )
+        )
+        .get(pk=pk)
+    )
+    deal = invoice.deal
+    contracts = list(deal.contracts.all()) if deal else []
+    return invoice, EmailTemplate.TemplateType.INVOICE, {
+        "invoice": invoice,
+        "deal": deal,
+        "client": deal.client if deal else None,
+        "contract": contracts[0] if contracts else None,
+    }
+
+
+def _payment_email(pk):
+    payment = Payment.objects.select_related(
+        "invoice", "invoice__deal", "invoice__deal__client"
+    ).get(pk=pk)
+    invoice = payment.invoice
+    deal = invoice.deal if invoice else None
+    return payment, EmailTemplate.TemplateType.PAYMENT, {
+        "payment": payment,
+        "invoice": invoice,
+        "deal": deal,
+        "client": deal.client if deal else None,
+    }
+
+
+# kind -> (label, loader returning (document, template_type, context))
+DOCUMENT_EMAILS = {
+    "proposal": ("Proposal", _proposal_email),
+    "contract": ("Contract", _contract_email),
+    "invoice": ("Invoice", _invoice_email),
+    "payment": ("Payment", _payment_email),
+}
+
+
+def send_document_email(kind, pk, to_email, requested_by_id=None):
+    """
+    Render and send one document email (runs on the background thread).
+    """
+    label, load = DOCUMENT_EMAILS[kind]
+    document, template_type, context = load(pk)
+
+    try:
+        result = send_templated_email(
+            template_type=template_type,
+            to_emails=to_email,
+            context=context,
+        )
+        error = None if result.ok else (result.error or "Email send failed.")
+    except Exception as exc:  # template lookup / render errors
+        error = str(exc) or "Email send failed."
+
+    if error and requested_by_id:
+        recipient = get_user_model().objects.filter(pk=requested_by_id).first()
+        if recipient:
+            create_notification(
+                recipient=recipient,
+                notif_type=Notification.Type.EMAIL_FAILED,
+                target=document,
+                message=f"{label} email to {to_email} failed: {error}",
+            )
+
+
+def queue_document_email(kind, pk, to_email, requested_by=None):
+    """
+    Send the email after the current transaction commits, off the request.
+    """
+    run_in_background(
+        send_document_email,
+        kind,
+        pk,
+        to_email,
+        requested_by_id=getattr(requested_by, "pk", None),
+    )
@@ -1,5 +1,6 @@
 # sales/forms.py
 from django import forms
+from django.core.cache import cache
 from django.forms import inlineformset_factory
 from django.forms.models import BaseInlineFormSet
 
@@ -11,40 +12,14 @@ from .models import (
     Invoice,
     Payment,
 )
+from common.forms import BootstrapModelForm
 from services.models import Service, Package
-
-class BootstrapModelForm(forms.ModelForm):
-    """
-    Base form to automatically add Bootstrap classes to widgets.
-    - Text / number / email / URL / textarea / date => form-control
-    - Select / ModelChoiceField => form-select
-    - Checkbox => form-check-input
-    """
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        for name, field in self.fields.items():
-            widget = field.widget
-
-            # Keep any existing classes
-            existing_classes = widget.attrs.get("class", "")
-
-            # Checkbox
-            if isinstance(widget, forms.CheckboxInput):
-                widget.attrs["class"] = (existing_classes + " form-check-input").strip()
-
-            # Selects (ChoiceField, ModelChoiceField, etc.)
-            elif isinstance(widget, (forms.Select, forms.SelectMultiple)):
-                widget.attrs["class"] = (existing_classes + " form-select").strip()
-
-            # Everything else → form-control
-            else:
-                widget.attrs["class"] = (existing_classes + " form-control").strip()
+from .utils import CATALOG_CACHE_TIMEOUT, CATALOG_CHOICES_CACHE_KEY
 
 class BaseProposalItemFormSet(BaseInlineFormSet):
     def __init__(self, *args, **kwargs):
-        self.catalog_choices = kwargs.pop("catalog_choices", get_catalog_choices())
+        # only built when the caller didn't pass them in
+        self.catalog_choices = kwargs.pop("catalog_choices", None) or get_catalog_choices()
         super().__init__(*args, **kwargs)
 
     def _construct_form(self, i, **kwargs):
@@ -81,11 +56,21 @@ class DealForm(BootstrapModelForm):
 # ---------------------------------------------------------
 # Proposal + ProposalItem
 # ---------------------------------------------------------
-def get_catalog_choices():
+def _build_catalog_choices():
     service_choices = [(f"S:{s.id}", f"Service — {s.name}") for s in Service.objects.all().order_by("name")]
     package_choices = [(f"P:{p.id}", f"Package — {p.name}") for p in Package.objects.all().order_by("name")]
     return [("", "Select item...")] + service_choices + package_choices
 
+
+def get_catalog_choices():
+    """
+    Service/package dropdown choices, cached until a Service/Package
+    changes (see sales/signals.py).
+    """
+    return cache.get_or_set(
+        CATALOG_CHOICES_CACHE_KEY, _build_catalog_choices, CATALOG_CACHE_TIMEOUT
+    )
+
 class ProposalForm(BootstrapModelForm):
     class Meta:
         model = Proposal
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:38
+
+from django.db import migrations, models
+
+
+def seed_sequences(apps, schema_editor):
+    """
+    Start each counter after the highest number already issued.
+    """
+    NumberSequence = apps.get_model("sales", "NumberSequence")
+
+    for model_name, prefix in (("Contract", "CTR"), ("Invoice", "INV")):
+        model = apps.get_model("sales", model_name)
+        last = 0
+        for number in model.objects.filter(number__startswith=prefix).values_list("number", flat=True):
+            try:
+                last = max(last, int(number[len(prefix):]))
+            except ValueError:
+                continue
+        NumberSequence.objects.update_or_create(
+            prefix=prefix,
+            defaults={"next_value": last + 1},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0008_invoiceitem_line_subtotal_invoiceitem_tax_amount_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NumberSequence',
+            fields=[
+                ('prefix', models.CharField(max_length=16, primary_key=True, serialize=False)),
+                ('next_value', models.BigIntegerField(default=1)),
+            ],
+        ),
+        migrations.RunPython(seed_sequences, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0008_contact_allow_marketing'),
+        ('sales', '0009_numbersequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['-created_at'], name='sales_contr_created_95875a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deal',
+            index=models.Index(fields=['-created_at'], name='sales_deal_created_d3033a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deal',
+            index=models.Index(fields=['stage', 'is_active'], name='sales_deal_stage_9f132a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deal',
+            index=models.Index(fields=['client', '-created_at'], name='sales_deal_client__d90d4b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['-issue_date'], name='sales_invoi_issue_d_0b5229_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['-created_at'], name='sales_payme_created_2cbf5d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['invoice', '-date'], name='sales_payme_invoice_cdf5f6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['-created_at'], name='sales_propo_created_69bc14_idx'),
+        ),
+    ]
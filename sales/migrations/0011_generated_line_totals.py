@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-16 07:51
+
+import django.db.models.expressions
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0010_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='contractitem',
+            name='line_total',
+        ),
+        migrations.AddField(
+            model_name='contractitem',
+            name='line_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('unit_price'), '*', models.F('quantity')), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.RemoveField(
+            model_name='invoiceitem',
+            name='line_subtotal',
+        ),
+        migrations.AddField(
+            model_name='invoiceitem',
+            name='line_subtotal',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('unit_price'), '*', models.F('quantity')), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.RemoveField(
+            model_name='invoiceitem',
+            name='line_total',
+        ),
+        migrations.AddField(
+            model_name='invoiceitem',
+            name='line_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('unit_price'), '*', models.F('quantity')), '+', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('unit_price'), '*', models.F('quantity')), '*', models.F('tax_rate')), '*', models.Value(Decimal('0.01')))), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.RemoveField(
+            model_name='invoiceitem',
+            name='tax_amount',
+        ),
+        migrations.AddField(
+            model_name='invoiceitem',
+            name='tax_amount',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('unit_price'), '*', models.F('quantity')), '*', models.F('tax_rate')), '*', models.Value(Decimal('0.01'))), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.RemoveField(
+            model_name='proposalitem',
+            name='line_total',
+        ),
+        migrations.AddField(
+            model_name='proposalitem',
+            name='line_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('unit_price'), '*', models.F('quantity')), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+    ]
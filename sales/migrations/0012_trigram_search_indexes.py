@@ -0,0 +1,51 @@
+# Trigram GIN indexes for the sales list-view search (PostgreSQL only).
+
+from django.db import migrations
+
+
+# (index name, table, column) - columns hit by `icontains` in sales/views.py.
+# crm_client.name is included because the deal/invoice lists search it.
+TRIGRAM_INDEXES = [
+    ("sales_deal_name_trgm", "sales_deal", "name"),
+    ("sales_proposal_title_trgm", "sales_proposal", "title"),
+    ("sales_contract_number_trgm", "sales_contract", "number"),
+    ("sales_invoice_number_trgm", "sales_invoice", "number"),
+    ("sales_payment_reference_trgm", "sales_payment", "reference"),
+    ("crm_client_name_trgm", "crm_client", "name"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    With pg_trgm, Postgres serves `ILIKE '%q%'` (Django's icontains) from a
+    GIN index instead of a sequential scan. SQLite has no equivalent: no-op.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} "
+            f"ON {table} USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0008_contact_allow_marketing'),
+        ('sales', '0011_generated_line_totals'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
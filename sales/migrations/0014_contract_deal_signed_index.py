@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0013_invoice_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['deal', '-signed_date', '-created_at'], name='sales_contr_deal_id_657136_idx'),
+        ),
+    ]
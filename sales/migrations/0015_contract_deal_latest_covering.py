@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0014_contract_deal_signed_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='contract',
+            name='sales_contr_deal_id_657136_idx',
+        ),
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['deal', '-signed_date', '-created_at'], include=('id',), name='sales_contract_deal_latest'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0008_contact_allow_marketing'),
+        ('sales', '0015_contract_deal_latest_covering'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contract',
+            index=models.Index(fields=['status', '-created_at'], name='sales_contr_status_dd9d2f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deal',
+            index=models.Index(fields=['stage', '-created_at'], name='sales_deal_stage_4d2bab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['status', '-issue_date', '-id'], name='sales_invoi_status_6bc2a3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['method', 'payment_type', '-created_at'], name='sales_payme_method_ff8ab3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='proposal',
+            index=models.Index(fields=['status', '-created_at'], name='sales_propo_status_2f739e_idx'),
+        ),
+    ]
@@ -1,17 +1,31 @@
 # sales/models.py
+import threading
+from contextlib import contextmanager
+
 from django.conf import settings
 from django.db import models, transaction
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from common.models import TimeStamped, Owned
+from common.models import MetricOwnerMixin, TimeStamped, Owned
 from crm.models import Client
 from services.models import Service, Package
 
 from django.core.exceptions import ValidationError
-from django.db.models import Sum
+from django.db.models import Case, F, OuterRef, Prefetch, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
 from decimal import Decimal
-from django.db import IntegrityError
+
+
+# Rows per INSERT when copying line items between documents
+BULK_BATCH_SIZE = 500
+
+# Shared Decimal constants (avoid re-parsing literals on every save)
+_ZERO = Decimal("0.00")
+# Percent -> fraction. A decimal literal, so SQLite doesn't integer-divide
+# whole-number prices and rates.
+_PERCENT = Decimal("0.01")
 
 
 # -------------------------------------------------------------------
@@ -69,11 +83,201 @@ class PaymentType(models.TextChoices):
     OTHER = "other", _("Other")
 
 
+# -------------------------------------------------------------------
+# Document numbering
+# -------------------------------------------------------------------
+
+class NumberSequence(models.Model):
+    """
+    Next free number per document prefix (CTR, INV, ...).
+    Rows are locked while a number is handed out, so concurrent
+    creates are serialized here instead of colliding on the unique index.
+    """
+
+    prefix = models.CharField(max_length=16, primary_key=True)
+    next_value = models.BigIntegerField(default=1)
+
+    def __str__(self) -> str:
+        return f"{self.prefix} -> {self.next_value}"
+
+    @classmethod
+    def allocate(cls, prefix: str, seed=None) -> int:
+        """
+        Atomically fetch-and-increment the counter for `prefix`.
+        `seed` is an optional callable returning the last number already
+        in use; it only runs when the prefix has no row yet.
+        """
+        with transaction.atomic():
+            seq, _ = cls.objects.select_for_update().get_or_create(
+                prefix=prefix,
+                defaults={"next_value": lambda: (seed() if seed else 0) + 1},
+            )
+            value = seq.next_value
+            seq.next_value = value + 1
+            seq.save(update_fields=["next_value"])
+        return value
+
+
+class ImmutableNumberMixin:
+    """
+    Keeps `number` fixed after creation without re-reading the row:
+    the value loaded from the DB is remembered on the instance.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Deferred `number` (e.g. .only("id")) -> fall back to a query in save()
+        if "number" in instance.__dict__:
+            instance._loaded_number = instance.number
+        return instance
+
+    def _restore_loaded_number(self):
+        if not self.pk:
+            return
+        if hasattr(self, "_loaded_number"):
+            loaded = self._loaded_number
+        else:
+            loaded = type(self).objects.only("number").get(pk=self.pk).number
+        if loaded and self.number != loaded:
+            self.number = loaded
+
+
+def _sum_or_zero(field: str):
+    """
+    SUM(field) for .aggregate(), coalesced in SQL so an empty set gives 0.00
+    instead of None.
+    """
+    return Coalesce(
+        Sum(field),
+        Value(_ZERO),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def _sum_of_items(item_model, fk_name: str, field: str):
+    """
+    Correlated SUM(field) over a document's items, 0 when it has none.
+    Used inside Document.objects.filter(pk=...).update(...).
+    """
+    items = (
+        item_model.objects
+        .filter(**{fk_name: OuterRef("pk")})
+        .values(fk_name)
+        .annotate(s=Sum(field))
+        .values("s")
+    )
+    return Coalesce(
+        Subquery(items),
+        Value(_ZERO),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def _expire_fields(instance, fields):
+    """
+    Drop stale in-memory values after an UPDATE; they reload lazily on next
+    access, and a later plain save() skips them instead of writing them back.
+    """
+    for field in fields:
+        instance.__dict__.pop(field, None)
+
+
+_recalc_state = threading.local()
+
+
+def _deferred_recalc_ids(model) -> set:
+    """
+    Pks of `model` whose totals recalculation is postponed (this thread).
+    """
+    key = model._meta.label_lower
+    deferred = getattr(_recalc_state, "deferred", None)
+    if deferred is None:
+        deferred = _recalc_state.deferred = {}
+    return deferred.setdefault(key, set())
+
+
+@contextmanager
+def _defer_recalc(model, pk):
+    """
+    Suppress model.recalculate_for(pk) inside the block; it runs once
+    when the outermost block exits normally.
+    """
+    deferred = _deferred_recalc_ids(model)
+    outer = pk not in deferred
+    deferred.add(pk)
+    try:
+        yield
+    finally:
+        if outer:
+            deferred.discard(pk)
+
+    if outer:
+        model.recalculate_for(pk)
+
+
+# -------------------------------------------------------------------
+# QuerySets (detail pages load the whole document graph up front)
+# -------------------------------------------------------------------
+
+class DealQuerySet(models.QuerySet):
+    def with_full_graph(self):
+        return (
+            self.select_related("client", "owner")
+            .prefetch_related("proposals", "invoices")
+        )
+
+
+class ProposalQuerySet(models.QuerySet):
+    def with_full_graph(self):
+        return (
+            self.select_related("deal__client", "owner")
+            .prefetch_related(
+                Prefetch(
+                    "items",
+                    queryset=ProposalItem.objects.select_related("service", "package"),
+                ),
+            )
+        )
+
+
+class ContractQuerySet(models.QuerySet):
+    def with_full_graph(self):
+        return (
+            self.select_related("deal__client", "proposal", "owner")
+            .prefetch_related(
+                Prefetch(
+                    "items",
+                    queryset=ContractItem.objects.select_related("service", "package"),
+                ),
+                "deal__invoices",
+            )
+        )
+
+
+class InvoiceQuerySet(models.QuerySet):
+    def with_full_graph(self):
+        return (
+            self.select_related("deal__client", "owner")
+            .prefetch_related(
+                Prefetch(
+                    "items",
+                    queryset=InvoiceItem.objects.select_related(
+                        "contract_item__service",
+                        "contract_item__package",
+                        "contract_item__proposal_item__proposal",
+                    ).prefetch_related("contract_item__package__items__service"),
+                ),
+                "payments",
+            )
+        )
+
+
 # -------------------------------------------------------------------
 # Deal
 # -------------------------------------------------------------------
 
-class Deal(TimeStamped, Owned):
+class Deal(MetricOwnerMixin, TimeStamped, Owned):
     """
     Sales opportunity / booking pipeline item.
     """
@@ -106,8 +310,16 @@ class Deal(TimeStamped, Owned):
     is_active = models.BooleanField(default=True)
     closed_on = models.DateField(null=True, blank=True)
 
+    objects = DealQuerySet.as_manager()
+
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["-created_at"]),
+            models.Index(fields=["stage", "is_active"]),
+            models.Index(fields=["stage", "-created_at"]),
+            models.Index(fields=["client", "-created_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.client})"
@@ -159,9 +371,15 @@ class Proposal(TimeStamped, Owned):
 
     notes = models.TextField(blank=True)
 
+    objects = ProposalQuerySet.as_manager()
+
     class Meta:
         ordering = ("-created_at",)
         unique_together = ("deal", "version")
+        indexes = [
+            models.Index(fields=["-created_at"]),
+            models.Index(fields=["status", "-created_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"Proposal #{self.version} for {self.deal}"
@@ -169,23 +387,58 @@ class Proposal(TimeStamped, Owned):
     def get_absolute_url(self):
         return reverse("sales:proposal_detail", args=[self.pk])
     
+    TOTAL_FIELDS = ("subtotal", "total", "updated_at")
+
+    @classmethod
+    def recalculate_for(cls, proposal_id) -> bool:
+        """
+        Recompute subtotal/total for a proposal in one UPDATE, without
+        loading it: total = max(subtotal - discount + tax, 0).
+        Returns False when postponed by defer_recalc().
+        """
+        if proposal_id in _deferred_recalc_ids(cls):
+            return False
+
+        subtotal = _sum_of_items(ProposalItem, "proposal", "line_total")
+        cls.objects.filter(pk=proposal_id).update(
+            subtotal=subtotal,
+            total=Greatest(
+                subtotal - F("discount") + F("tax"),
+                Value(_ZERO),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2),
+            ),
+            updated_at=timezone.now(),
+        )
+        return True
+
     def recalculate_totals(self, save=True):
-        agg = self.items.aggregate(subtotal=Sum("line_total"))
-        subtotal = agg["subtotal"] or Decimal("0.00")
+        if save:
+            if type(self).recalculate_for(self.pk):
+                _expire_fields(self, self.TOTAL_FIELDS)
+            return
+
+        subtotal = self.items.aggregate(subtotal=_sum_or_zero("line_total"))["subtotal"]
 
         self.subtotal = subtotal
         # Flat discount amount (existing behavior)
-        discount = self.discount or Decimal("0.00")
-        tax = self.tax or Decimal("0.00")
+        discount = self.discount or _ZERO
+        tax = self.tax or _ZERO
 
         total = subtotal - discount + tax
         if total < 0:
-            total = Decimal("0.00")
+            total = _ZERO
 
         self.total = total
 
-        if save:
-            self.save(update_fields=["subtotal", "total", "updated_at"])
+    @contextmanager
+    def defer_recalc(self):
+        """
+        Suppress per-item recalculation (e.g. while a formset saves);
+        totals are recomputed once when the block exits normally.
+        """
+        with _defer_recalc(Proposal, self.pk):
+            yield self
+        _expire_fields(self, self.TOTAL_FIELDS)
 
 
 class ProposalItem(models.Model):
@@ -219,7 +472,12 @@ class ProposalItem(models.Model):
     )
     quantity = models.PositiveIntegerField(default=1)
     unit_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
-    line_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # computed by the database (GENERATED ALWAYS AS ... STORED)
+    line_total = models.GeneratedField(
+        expression=F("unit_price") * F("quantity"),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ("id",)
@@ -255,29 +513,30 @@ class ProposalItem(models.Model):
         # Auto unit_price if zero and something is linked
         if (self.unit_price is None or self.unit_price == 0):
             if self.service:
-                self.unit_price = self.service.base_price or Decimal("0.00")
+                self.unit_price = self.service.base_price or _ZERO
             elif self.package:
-                self.unit_price = self.package.total_price or Decimal("0.00")
+                self.unit_price = self.package.total_price or _ZERO
 
-        self.line_total = (self.unit_price or Decimal("0.00")) * (self.quantity or 0)
         super().save(*args, **kwargs)
 
-        # ✅ keep proposal totals correct
-        if self.proposal_id:
-            self.proposal.recalculate_totals(save=True)
+        # ✅ keep proposal totals correct (by id: no proposal SELECT)
+        if self.proposal_id and Proposal.recalculate_for(self.proposal_id):
+            if ProposalItem.proposal.is_cached(self):
+                _expire_fields(self.proposal, Proposal.TOTAL_FIELDS)
 
     def delete(self, *args, **kwargs):
-        proposal = self.proposal
+        proposal_id = self.proposal_id
         super().delete(*args, **kwargs)
-        if proposal and proposal.pk:
-            proposal.recalculate_totals(save=True)
+        if proposal_id and Proposal.recalculate_for(proposal_id):
+            if ProposalItem.proposal.is_cached(self):
+                _expire_fields(self.proposal, Proposal.TOTAL_FIELDS)
 
 
 # -------------------------------------------------------------------
 # Contract & ContractItem
 # -------------------------------------------------------------------
 
-class Contract(TimeStamped, Owned):
+class Contract(ImmutableNumberMixin, TimeStamped, Owned):
     """
     Signed agreement based on a proposal/deal.
     Contract items are duplicated from ProposalItems so the contract
@@ -327,8 +586,21 @@ class Contract(TimeStamped, Owned):
         blank=True,
     )
 
+    objects = ContractQuerySet.as_manager()
+
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["-created_at"]),
+            models.Index(fields=["status", "-created_at"]),
+            # latest contract per deal (invoice creation); `id` is included so
+            # the only("id", "deal") lookup is an index-only scan on Postgres
+            models.Index(
+                fields=["deal", "-signed_date", "-created_at"],
+                include=["id"],
+                name="sales_contract_deal_latest",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Contract {self.number or '—'} - {self.deal}"
@@ -341,10 +613,17 @@ class Contract(TimeStamped, Owned):
     def _generate_next_number(cls) -> str:
         """
         Generate the next sequential contract number like CTR001, CTR002, ...
-        Looks at the highest existing number starting with the prefix.
+        Numbers come from NumberSequence; must run inside the insert's transaction.
+        """
+        number = NumberSequence.allocate(cls.CODE_PREFIX, seed=cls._last_issued_number)
+        return f"{cls.CODE_PREFIX}{number:0{cls.CODE_PAD}d}"
+
+    @classmethod
+    def _last_issued_number(cls) -> int:
+        """
+        Highest existing number for the prefix (used to seed NumberSequence).
         """
         prefix = cls.CODE_PREFIX
-        pad = cls.CODE_PAD
 
         last = (
             cls.objects
@@ -363,29 +642,27 @@ class Contract(TimeStamped, Owned):
         else:
             number = 0
 
-        return f"{prefix}{number + 1:0{pad}d}"
+        return number
 
     def save(self, *args, **kwargs):
         # ✅ Immutable number after creation (backend enforced)
-        if self.pk:
-            old = type(self).objects.only("number").get(pk=self.pk)
-            if old.number and self.number != old.number:
-                self.number = old.number
+        self._restore_loaded_number()
 
         if self.number:
-            return super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
+            self._loaded_number = self.number
+            return
 
-        # ✅ Concurrency-safe number generation
-        for _ in range(10):
+        # ✅ Concurrency-safe number generation: the sequence row stays
+        # locked until the insert commits (and is rolled back with it).
+        with transaction.atomic():
             self.number = self._generate_next_number()
             try:
-                with transaction.atomic():
-                    return super().save(*args, **kwargs)
-            except IntegrityError:
+                super().save(*args, **kwargs)
+            except Exception:
                 self.number = ""
-                continue
-
-        raise IntegrityError("Could not generate unique Contract number after retries.")
+                raise
+        self._loaded_number = self.number
 
 
     # ---------- Helper to populate from proposal ---------- #
@@ -400,20 +677,39 @@ class Contract(TimeStamped, Owned):
 
         # Remember where it came from
         if not self.proposal_id:
+            # straight UPDATE: skips save() and its number-immutability check
             self.proposal = proposal
-            self.save(update_fields=["proposal"])
-
-        for pitem in proposal.items.all():
-            ContractItem.objects.create(
-                contract=self,
-                proposal_item=pitem,
-                service=pitem.service,
-                package=pitem.package,
-                description=pitem.description,
-                quantity=pitem.quantity,
-                unit_price=pitem.unit_price,
+            self.updated_at = timezone.now()
+            Contract.objects.filter(pk=self.pk).update(
+                proposal=proposal, updated_at=self.updated_at
             )
 
+        # One multi-row INSERT instead of a save() per line.
+        # ProposalItem.save() already filled description/unit_price.
+        ContractItem.objects.bulk_create(
+            [
+                ContractItem(
+                    contract=self,
+                    # FK ids only: never loads the related rows
+                    proposal_item_id=pitem.id,
+                    service_id=pitem.service_id,
+                    package_id=pitem.package_id,
+                    description=pitem.description,
+                    quantity=pitem.quantity,
+                    unit_price=pitem.unit_price,
+                )
+                for pitem in (
+                    proposal.items
+                    .only(
+                        "id", "proposal", "service", "package",
+                        "description", "quantity", "unit_price",
+                    )
+                    .iterator(chunk_size=BULK_BATCH_SIZE)
+                )
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
 
 class ContractItem(models.Model):
     """
@@ -452,7 +748,12 @@ class ContractItem(models.Model):
     description = models.CharField(max_length=255, blank=True)
     quantity = models.PositiveIntegerField(default=1)
     unit_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
-    line_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # computed by the database (GENERATED ALWAYS AS ... STORED)
+    line_total = models.GeneratedField(
+        expression=F("unit_price") * F("quantity"),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ("id",)
@@ -480,20 +781,20 @@ class ContractItem(models.Model):
 
         if (self.unit_price is None or self.unit_price == 0):
             if self.service:
-                self.unit_price = self.service.base_price or 0
+                self.unit_price = self.service.base_price or _ZERO
             elif self.package:
-                self.unit_price = self.package.total_price or 0
+                self.unit_price = self.package.total_price or _ZERO
             elif self.proposal_item:
-                self.unit_price = self.proposal_item.unit_price or 0
+                self.unit_price = self.proposal_item.unit_price or _ZERO
 
-        self.line_total = (self.unit_price or 0) * (self.quantity or 0)
         super().save(*args, **kwargs)
 
 
 # -------------------------------------------------------------------
 # Invoice & InvoiceItem
 # -------------------------------------------------------------------
-class Invoice(TimeStamped, Owned):
+
+class Invoice(ImmutableNumberMixin, TimeStamped, Owned):
     """
     Billing document with itemized charges.
     """
@@ -531,8 +832,16 @@ class Invoice(TimeStamped, Owned):
 
     notes = models.TextField(blank=True)
 
+    objects = InvoiceQuerySet.as_manager()
+
     class Meta:
         ordering = ("-issue_date",)
+        indexes = [
+            # list ordering + keyset pagination cursor
+            models.Index(fields=["-issue_date", "-id"]),
+            # status filter + the same ordering
+            models.Index(fields=["status", "-issue_date", "-id"]),
+        ]
 
     def __str__(self):
         return f"Invoice {self.number}"
@@ -545,8 +854,15 @@ class Invoice(TimeStamped, Owned):
     # -----------------------------------------------------------
     @classmethod
     def _generate_next_number(cls) -> str:
+        number = NumberSequence.allocate(cls.CODE_PREFIX, seed=cls._last_issued_number)
+        return f"{cls.CODE_PREFIX}{number:0{cls.CODE_PAD}d}"
+
+    @classmethod
+    def _last_issued_number(cls) -> int:
+        """
+        Highest existing number for the prefix (used to seed NumberSequence).
+        """
         prefix = cls.CODE_PREFIX
-        pad = cls.CODE_PAD
 
         last = (
             cls.objects.filter(number__startswith=prefix)
@@ -564,51 +880,81 @@ class Invoice(TimeStamped, Owned):
         else:
             number = 0
 
-        return f"{prefix}{number + 1:0{pad}d}"
+        return number
 
     def save(self, *args, **kwargs):
         # ✅ Immutable number after creation
-        if self.pk:
-            old = type(self).objects.only("number").get(pk=self.pk)
-            if old.number and self.number != old.number:
-                self.number = old.number
+        self._restore_loaded_number()
 
         if self.number:
-            return super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
+            self._loaded_number = self.number
+            return
 
-        # ✅ Concurrency-safe number generation
-        for _ in range(10):
+        # ✅ Concurrency-safe number generation: the sequence row stays
+        # locked until the insert commits (and is rolled back with it).
+        with transaction.atomic():
             self.number = self._generate_next_number()
             try:
-                with transaction.atomic():
-                    return super().save(*args, **kwargs)
-            except IntegrityError:
+                super().save(*args, **kwargs)
+            except Exception:
                 self.number = ""
-                continue
-
-        raise IntegrityError("Could not generate unique Invoice number after retries.")
+                raise
+        self._loaded_number = self.number
 
 
     # -----------------------------------------------------------
     # Computations
     # -----------------------------------------------------------
+    TOTAL_FIELDS = ("subtotal", "tax", "total", "updated_at")
+
     @property
     def balance(self):
-        return (self.total or 0) - (self.amount_paid or 0)
+        return (self.total or _ZERO) - (self.amount_paid or _ZERO)
 
     def recalculate_totals(self, save=True):
-        agg = self.items.aggregate(
-            subtotal=Sum("line_subtotal"),
-            tax=Sum("tax_amount"),
-            total=Sum("line_total"),
-        )
+        if not save:
+            agg = self.items.aggregate(
+                subtotal=_sum_or_zero("line_subtotal"),
+                tax=_sum_or_zero("tax_amount"),
+                total=_sum_or_zero("line_total"),
+            )
 
-        self.subtotal = agg["subtotal"] or Decimal("0.00")
-        self.tax = agg["tax"] or Decimal("0.00")
-        self.total = agg["total"] or Decimal("0.00")
+            self.subtotal = agg["subtotal"]
+            self.tax = agg["tax"]
+            self.total = agg["total"]
+            return
 
-        if save:
-            self.save(update_fields=["subtotal", "tax", "total", "updated_at"])
+        if type(self).recalculate_for(self.pk):
+            _expire_fields(self, self.TOTAL_FIELDS)
+
+    @classmethod
+    def recalculate_for(cls, invoice_id) -> bool:
+        """
+        Recompute totals for an invoice in one UPDATE ... SET x = (SELECT SUM(...)),
+        without loading it. Returns False when postponed by defer_recalc().
+        """
+        # Inside defer_recalc(): the single UPDATE runs on exit instead
+        if invoice_id in _deferred_recalc_ids(cls):
+            return False
+
+        cls.objects.filter(pk=invoice_id).update(
+            subtotal=_sum_of_items(InvoiceItem, "invoice", "line_subtotal"),
+            tax=_sum_of_items(InvoiceItem, "invoice", "tax_amount"),
+            total=_sum_of_items(InvoiceItem, "invoice", "line_total"),
+            updated_at=timezone.now(),
+        )
+        return True
+
+    @contextmanager
+    def defer_recalc(self):
+        """
+        Suppress per-item recalculation for this invoice; totals are
+        recomputed once when the block exits normally.
+        """
+        with _defer_recalc(Invoice, self.pk):
+            yield self
+        _expire_fields(self, self.TOTAL_FIELDS)
 
 
     @transaction.atomic
@@ -619,22 +965,40 @@ class Invoice(TimeStamped, Owned):
         # ✅ if invoice.deal not set, set it
         if not self.deal_id:
             self.deal = contract.deal
-            self.save(update_fields=["deal", "updated_at"])
+            self.updated_at = timezone.now()
+            Invoice.objects.filter(pk=self.pk).update(
+                deal=contract.deal, updated_at=self.updated_at
+            )
 
         if clear_existing:
             self.items.all().delete()
 
-        for citem in contract.items.all():
-            InvoiceItem.objects.create(
-                invoice=self,
-                contract_item=citem,
-                description=citem.description,
-                quantity=citem.quantity,
-                unit_price=citem.unit_price,
-                tax_rate=Decimal("0.00"),
+        items = []
+        citems = (
+            contract.items
+            .only("id", "contract", "description", "quantity", "unit_price")
+            .iterator(chunk_size=BULK_BATCH_SIZE)
+        )
+        for citem in citems:
+            # line totals are generated columns: nothing to compute here
+            items.append(
+                InvoiceItem(
+                    invoice=self,
+                    contract_item_id=citem.id,
+                    description=citem.description,
+                    quantity=citem.quantity,
+                    unit_price=citem.unit_price,
+                    tax_rate=_ZERO,
+                )
             )
 
-        self.recalculate_totals(save=True)
+        # bulk_create skips InvoiceItem.save(), so check the lock once here
+        if items and self.status != InvoiceStatus.DRAFT:
+            raise ValidationError("Cannot modify invoice items after invoice is issued.")
+
+        # ✅ single recompute (on exit) after all rows are in
+        with self.defer_recalc():
+            InvoiceItem.objects.bulk_create(items, batch_size=BULK_BATCH_SIZE)
 
 
 
@@ -665,10 +1029,25 @@ class InvoiceItem(models.Model):
         help_text=_("Tax rate as percentage, e.g. 5.00 (0 for now)."),
     )
 
-    # ✅ NEW: make invoice math correct
-    line_subtotal = models.DecimalField(max_digits=12, decimal_places=2, default=0)
-    tax_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
-    line_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # ✅ invoice math, computed by the database (GENERATED ALWAYS AS ... STORED)
+    line_subtotal = models.GeneratedField(
+        expression=F("unit_price") * F("quantity"),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
+    tax_amount = models.GeneratedField(
+        expression=F("unit_price") * F("quantity") * F("tax_rate") * Value(_PERCENT),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
+    line_total = models.GeneratedField(
+        expression=(
+            F("unit_price") * F("quantity")
+            + F("unit_price") * F("quantity") * F("tax_rate") * Value(_PERCENT)
+        ),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ("id",)
@@ -676,42 +1055,56 @@ class InvoiceItem(models.Model):
     def __str__(self) -> str:
         return f"{self.description} x {self.quantity}"
 
+    def _invoice_is_locked(self) -> bool:
+        """
+        True once the invoice left DRAFT. Uses the loaded invoice if there
+        is one, else reads just its status column.
+        """
+        if not self.invoice_id:
+            return False
+        if InvoiceItem.invoice.is_cached(self):
+            status = self.invoice.status
+        else:
+            status = (
+                Invoice.objects
+                .filter(pk=self.invoice_id)
+                .values_list("status", flat=True)
+                .first()
+            )
+        return status != InvoiceStatus.DRAFT
+
     def clean(self):
         super().clean()
         # ✅ Lock invoice items once invoice is issued/paid/etc.
-        if self.invoice_id and self.invoice.status != InvoiceStatus.DRAFT:
+        if self._invoice_is_locked():
             raise ValidationError("Cannot modify invoice items after invoice is issued.")
 
     @transaction.atomic
-    def save(self, *args, **kwargs):
-        self.full_clean()  # ✅ enforce lock via clean()
-
-        qty = self.quantity or 0
-        unit = self.unit_price or Decimal("0.00")
-        rate = self.tax_rate or Decimal("0.00")
-
-        base_total = unit * qty
-        tax_amount = (base_total * rate) / Decimal("100.00")
-
-        self.line_subtotal = base_total
-        self.tax_amount = tax_amount
-        self.line_total = base_total + tax_amount
+    def save(self, *args, skip_validation=False, **kwargs):
+        # ✅ enforce the lock; field validation already ran in the ModelForm.
+        # Trusted bulk paths that checked the invoice once pass skip_validation.
+        if not skip_validation and self._invoice_is_locked():
+            raise ValidationError("Cannot modify invoice items after invoice is issued.")
 
+        # line_subtotal / tax_amount / line_total are computed by the database
         super().save(*args, **kwargs)
 
-        if self.invoice_id:
-            self.invoice.recalculate_totals(save=True)
+        # by id: no invoice SELECT
+        if self.invoice_id and Invoice.recalculate_for(self.invoice_id):
+            if InvoiceItem.invoice.is_cached(self):
+                _expire_fields(self.invoice, Invoice.TOTAL_FIELDS)
 
     @transaction.atomic
     def delete(self, *args, **kwargs):
         # ✅ Lock deletes once issued
-        if self.invoice_id and self.invoice.status != InvoiceStatus.DRAFT:
+        if self._invoice_is_locked():
             raise ValidationError("Cannot delete invoice items after invoice is issued.")
 
-        invoice = self.invoice
+        invoice_id = self.invoice_id
         super().delete(*args, **kwargs)
-        if invoice and invoice.pk:
-            invoice.recalculate_totals(save=True)
+        if invoice_id and Invoice.recalculate_for(invoice_id):
+            if InvoiceItem.invoice.is_cached(self):
+                _expire_fields(self.invoice, Invoice.TOTAL_FIELDS)
 
 
 
@@ -760,6 +1153,12 @@ class Payment(TimeStamped, Owned):
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["-created_at"]),
+            models.Index(fields=["invoice", "-date"]),
+            # list filters (method, optionally payment_type) + list ordering
+            models.Index(fields=["method", "payment_type", "-created_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"Payment {self.amount} for {self.invoice}"
@@ -767,6 +1166,14 @@ class Payment(TimeStamped, Owned):
     def get_absolute_url(self):
         return reverse("sales:invoice_detail", args=[self.invoice_id])
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remembered so save() can apply just the difference to the invoice
+        if "invoice_id" in instance.__dict__ and "amount" in instance.__dict__:
+            instance._loaded_paid = (instance.invoice_id, instance.amount)
+        return instance
+
     # ---------- VALIDATION: don't allow overpayment ---------- #
     def clean(self):
         super().clean()
@@ -774,14 +1181,9 @@ class Payment(TimeStamped, Owned):
         if not self.invoice or self.amount is None:
             return
 
-        already_paid = (
-            self.invoice.payments
-            .exclude(pk=self.pk)  # exclude self when editing
-            .aggregate(total=Sum("amount"))["total"]
-            or 0
-        )
+        already_paid = self._already_paid()
 
-        invoice_total = self.invoice.total or 0
+        invoice_total = self.invoice.total or _ZERO
         remaining = invoice_total - already_paid
 
         if self.amount > remaining:
@@ -789,27 +1191,95 @@ class Payment(TimeStamped, Owned):
                 "amount": f"Payment exceeds remaining balance ({remaining})."
             })
 
-    # ---------- Helper to update invoice totals/status ---------- #
-    def _update_invoice_amount_paid(self):
+    def _already_paid(self):
         """
-        Recalculate invoice.amount_paid from all payments
-        and adjust invoice.status if you want.
+        Sum of the invoice's other payments (excludes self when editing).
         """
-        invoice = self.invoice
+        return (
+            Payment.objects
+            .filter(invoice_id=self.invoice_id)
+            .exclude(pk=self.pk)
+            .aggregate(total=_sum_or_zero("amount"))["total"]
+        )
 
-        total_paid = (
-            invoice.payments.aggregate(total=Sum("amount"))["total"] or 0
+    # ---------- Bulk import (historical payments) ---------- #
+    @classmethod
+    @transaction.atomic
+    def bulk_import(cls, invoice_id, rows):
+        """
+        Create many payments for one invoice in a fixed number of queries:
+        one overpayment check, one multi-row INSERT, one invoice UPDATE.
+        `rows` are dicts of Payment field values (date, amount, method, ...).
+        """
+        # lock the invoice so concurrent payments can't slip past the check
+        invoice = (
+            Invoice.objects.select_for_update()
+            .only("id", "number", "total")
+            .get(pk=invoice_id)
         )
-        invoice.amount_paid = total_paid
+        payments = [cls(invoice=invoice, **row) for row in rows]
+        if not payments:
+            return []
+
+        # field validation only; clean()'s per-row SUM is replaced below.
+        # The invoice is already loaded and locked, so skip its per-row FK check.
+        for payment in payments:
+            payment.clean_fields(exclude=["invoice"])
+
+        incoming = sum((p.amount for p in payments), _ZERO)
+        already_paid = invoice.payments.aggregate(total=_sum_or_zero("amount"))["total"]
+        remaining = (invoice.total or _ZERO) - already_paid
+        if incoming > remaining:
+            raise ValidationError({
+                "amount": f"Payments exceed remaining balance ({remaining})."
+            })
+
+        cls.objects.bulk_create(payments, batch_size=BULK_BATCH_SIZE)
+        cls._apply_paid_delta(invoice_id, incoming)
+        return payments
+
+    # ---------- Helper to update invoice totals/status ---------- #
+    @staticmethod
+    def _apply_paid_delta(invoice_id, delta):
+        """
+        Shift invoice.amount_paid by `delta` and adjust invoice.status in one
+        UPDATE - no SUM over the payments. (SET expressions see the old row.)
+        """
+        new_paid = F("amount_paid") + delta
 
         # Optional: update status based on payment progress
-        if invoice.total and invoice.amount_paid >= invoice.total:
-            invoice.status = InvoiceStatus.PAID
-        elif invoice.amount_paid > 0 and invoice.amount_paid < invoice.total:
-            invoice.status = InvoiceStatus.PARTIALLY_PAID
-        # else: leave status as is (DRAFT/ISSUED/etc.)
+        # (else: leave status as is - DRAFT/ISSUED/etc.)
+        Invoice.objects.filter(pk=invoice_id).update(
+            amount_paid=new_paid,
+            status=Case(
+                When(total__gt=0, total__lte=new_paid, then=Value(InvoiceStatus.PAID)),
+                When(
+                    amount_paid__gt=-delta,
+                    total__gt=new_paid,
+                    then=Value(InvoiceStatus.PARTIALLY_PAID),
+                ),
+                default=F("status"),
+            ),
+            updated_at=timezone.now(),
+        )
 
-        invoice.save(update_fields=["amount_paid", "status", "updated_at"])
+    def _update_invoice_amount_paid(self, old_invoice_id=None, old_amount=None):
+        """
+        Move invoice.amount_paid by the change this save made
+        (whole amount on create; new - old on edit).
+        """
+        if old_invoice_id and old_invoice_id != self.invoice_id:
+            # payment moved to another invoice: take it off the old one
+            Payment._apply_paid_delta(old_invoice_id, -(old_amount or _ZERO))
+            old_amount = None
+
+        delta = self.amount - (old_amount or _ZERO)
+        if delta:
+            Payment._apply_paid_delta(self.invoice_id, delta)
+
+        # an already-loaded invoice reloads these lazily
+        if Payment.invoice.is_cached(self) and self.invoice is not None:
+            _expire_fields(self.invoice, ("amount_paid", "status", "updated_at"))
 
     # ---------- Override save & delete ---------- #
     @transaction.atomic
@@ -818,30 +1288,38 @@ class Payment(TimeStamped, Owned):
         Validate, save payment, then update related invoice totals.
         """
         self.full_clean()  # runs clean() + field validation
+
+        old_invoice_id = old_amount = None
+        if not self._state.adding:
+            if hasattr(self, "_loaded_paid"):
+                old_invoice_id, old_amount = self._loaded_paid
+            else:
+                old_invoice_id, old_amount = (
+                    Payment.objects.filter(pk=self.pk)
+                    .values_list("invoice_id", "amount")
+                    .first()
+                ) or (None, None)
+
         super().save(*args, **kwargs)
-        self._update_invoice_amount_paid()
+        self._update_invoice_amount_paid(old_invoice_id, old_amount)
+        self._loaded_paid = (self.invoice_id, self.amount)
 
     @transaction.atomic
     def delete(self, *args, **kwargs):
         """
         Ensure invoice totals are updated when a payment is deleted.
         """
-        invoice = self.invoice
-        super().delete(*args, **kwargs)
-
-        # re-fetch invoice to be safe
-        invoice.refresh_from_db()
-        total_paid = (
-            invoice.payments.aggregate(total=Sum("amount"))["total"] or 0
+        # the amount as stored (what amount_paid currently includes)
+        invoice_id, amount = getattr(
+            self, "_loaded_paid", (self.invoice_id, self.amount)
         )
-        invoice.amount_paid = total_paid
+        cached_invoice = self.invoice if Payment.invoice.is_cached(self) else None
 
-        if invoice.total and invoice.amount_paid >= invoice.total:
-            invoice.status = InvoiceStatus.PAID
-        elif invoice.amount_paid > 0 and invoice.amount_paid < invoice.total:
-            invoice.status = InvoiceStatus.PARTIALLY_PAID
-        else:
-            # you can choose to reset back to ISSUED, etc., if you like
-            pass
+        result = super().delete(*args, **kwargs)
 
-        invoice.save(update_fields=["amount_paid", "status", "updated_at"])
+        # one UPDATE: no invoice re-fetch, no SUM over the remaining payments
+        if invoice_id and amount:
+            Payment._apply_paid_delta(invoice_id, -amount)
+        if cached_invoice is not None:
+            _expire_fields(cached_invoice, ("amount_paid", "status", "updated_at"))
+        return result
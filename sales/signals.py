@@ -0,0 +1,22 @@
+# sales/signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from services.models import Service, Package
+from .utils import invalidate_catalog_caches
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Package)
+@receiver(post_delete, sender=Package)
+def clear_catalog_caches(sender, **kwargs):
+    """
+    Proposal forms cache the service/package price maps and dropdown
+    choices; drop them whenever a name or price may have changed.
+    Cleared after commit, so a request reading the old rows in the
+    meantime can't cache them again.
+    """
+    transaction.on_commit(invalidate_catalog_caches)
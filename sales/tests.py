@@ -1,3 +1,293 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.urls import reverse
+
+from crm.models import Client
+from .models import (
+    Contract,
+    Deal,
+    Invoice,
+    InvoiceItem,
+    InvoiceStatus,
+    NumberSequence,
+    Payment,
+)
+
+
+class InvoiceItemGeneratedTotalsTests(TestCase):
+    def setUp(self):
+        client = Client.objects.create(name="Test Client")
+        deal = Deal.objects.create(name="Test Deal", client=client)
+        self.invoice = Invoice.objects.create(deal=deal, issue_date=date(2026, 1, 1))
+
+    def test_whole_number_price_and_rate_keep_fractional_tax(self):
+        item = InvoiceItem.objects.create(
+            invoice=self.invoice,
+            description="Decor",
+            quantity=1,
+            unit_price=Decimal("99"),
+            tax_rate=Decimal("5"),
+        )
+        item.refresh_from_db()
+        self.assertEqual(item.line_subtotal, Decimal("99.00"))
+        self.assertEqual(item.tax_amount, Decimal("4.95"))
+        self.assertEqual(item.line_total, Decimal("103.95"))
+
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.subtotal, Decimal("99.00"))
+        self.assertEqual(self.invoice.tax, Decimal("4.95"))
+        self.assertEqual(self.invoice.total, Decimal("103.95"))
+
+
+class NumberSequenceTests(TestCase):
+    def setUp(self):
+        # start from an empty table (0009 seeds CTR/INV rows)
+        NumberSequence.objects.all().delete()
+        client = Client.objects.create(name="Test Client")
+        self.deal = Deal.objects.create(name="Test Deal", client=client)
+
+    def test_first_allocation_starts_at_one(self):
+        self.assertEqual(NumberSequence.allocate("TST"), 1)
+        self.assertEqual(NumberSequence.objects.get(prefix="TST").next_value, 2)
+
+    def test_first_allocation_uses_seed(self):
+        self.assertEqual(NumberSequence.allocate("TST", seed=lambda: 41), 42)
+
+    def test_counters_are_per_prefix(self):
+        self.assertEqual(NumberSequence.allocate("AAA"), 1)
+        self.assertEqual(NumberSequence.allocate("AAA"), 2)
+        self.assertEqual(NumberSequence.allocate("BBB"), 1)
+        self.assertEqual(NumberSequence.allocate("AAA"), 3)
+
+    def test_seed_ignored_once_row_exists(self):
+        NumberSequence.objects.create(prefix="TST", next_value=7)
+        self.assertEqual(NumberSequence.allocate("TST", seed=lambda: 100), 7)
+
+    def test_numbers_seeded_from_existing_documents(self):
+        Invoice.objects.create(deal=self.deal, issue_date=date(2026, 1, 1), number="INV041")
+        Contract.objects.create(deal=self.deal, number="CTR009")
+
+        invoice = Invoice.objects.create(deal=self.deal, issue_date=date(2026, 1, 2))
+        contract = Contract.objects.create(deal=self.deal)
+
+        self.assertEqual(invoice.number, "INV042")
+        self.assertEqual(contract.number, "CTR010")
+        self.assertEqual(
+            Invoice.objects.create(deal=self.deal, issue_date=date(2026, 1, 3)).number,
+            "INV043",
+        )
+
+    def test_number_is_immutable_after_creation(self):
+        invoice = Invoice.objects.create(deal=self.deal, issue_date=date(2026, 1, 1))
+        self.assertEqual(invoice.number, "INV001")
+
+        invoice.number = "INV999"
+        invoice.save()
+        self.assertEqual(invoice.number, "INV001")
+
+        # loaded without the number column: the stored value is re-read
+        deferred = Invoice.objects.only("id", "issue_date").get(pk=invoice.pk)
+        deferred.number = "INV999"
+        deferred.save()
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.number, "INV001")
+
+
+class PaymentInvoiceTotalsTests(TestCase):
+    def setUp(self):
+        client = Client.objects.create(name="Test Client")
+        self.deal = Deal.objects.create(name="Test Deal", client=client)
+        self.invoice = self._invoice_for(Decimal("100.00"))
+
+    def _invoice_for(self, total):
+        # items can only be added while the invoice is a draft
+        invoice = Invoice.objects.create(deal=self.deal, issue_date=date(2026, 1, 1))
+        InvoiceItem.objects.create(
+            invoice=invoice, description="Decor", quantity=1, unit_price=total
+        )
+        Invoice.objects.filter(pk=invoice.pk).update(status=InvoiceStatus.ISSUED)
+        invoice.refresh_from_db()
+        return invoice
+
+    def _pay(self, invoice, amount):
+        return Payment.objects.create(
+            invoice=invoice, date=date(2026, 1, 5), amount=Decimal(amount)
+        )
+
+    def assertInvoice(self, invoice, amount_paid, status):
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.amount_paid, Decimal(amount_paid))
+        self.assertEqual(invoice.status, status)
+
+    def test_create_edit_delete(self):
+        payment = self._pay(self.invoice, "40.00")
+        self.assertInvoice(self.invoice, "40.00", InvoiceStatus.PARTIALLY_PAID)
+
+        payment.amount = Decimal("100.00")
+        payment.save()
+        self.assertInvoice(self.invoice, "100.00", InvoiceStatus.PAID)
+
+        # loaded fresh: the stored amount comes from from_db
+        payment = Payment.objects.get(pk=payment.pk)
+        payment.amount = Decimal("60.00")
+        payment.save()
+        self.assertInvoice(self.invoice, "60.00", InvoiceStatus.PARTIALLY_PAID)
+
+        other = self._pay(self.invoice, "10.00")
+        payment.delete()
+        self.assertInvoice(self.invoice, "10.00", InvoiceStatus.PARTIALLY_PAID)
+
+        # last payment gone: status is left as it was
+        Payment.objects.get(pk=other.pk).delete()
+        self.assertInvoice(self.invoice, "0.00", InvoiceStatus.PARTIALLY_PAID)
+
+    def test_overpayment_is_rejected(self):
+        self._pay(self.invoice, "90.00")
+        with self.assertRaises(ValidationError):
+            self._pay(self.invoice, "20.00")
+        self.assertInvoice(self.invoice, "90.00", InvoiceStatus.PARTIALLY_PAID)
+
+    def test_move_payment_to_another_invoice(self):
+        second = self._invoice_for(Decimal("50.00"))
+        payment = self._pay(self.invoice, "50.00")
+        self._pay(self.invoice, "10.00")
+
+        payment.invoice = second
+        payment.save()
+
+        self.assertInvoice(self.invoice, "10.00", InvoiceStatus.PARTIALLY_PAID)
+        self.assertInvoice(second, "50.00", InvoiceStatus.PAID)
+
+
+class PaymentBulkImportTests(TestCase):
+    def setUp(self):
+        client = Client.objects.create(name="Test Client")
+        deal = Deal.objects.create(name="Test Deal", client=client)
+        self.invoice = Invoice.objects.create(deal=deal, issue_date=date(2026, 1, 1))
+        InvoiceItem.objects.create(
+            invoice=self.invoice, description="Decor", quantity=1, unit_price=Decimal("1000")
+        )
+
+    def _rows(self, n, amount="10.00"):
+        return [{"date": date(2026, 1, 5), "amount": Decimal(amount)} for _ in range(n)]
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # savepoint, lock, SUM check, INSERT, invoice UPDATE, release
+        with self.assertNumQueries(6):
+            Payment.bulk_import(self.invoice.pk, self._rows(1))
+        with self.assertNumQueries(6):
+            Payment.bulk_import(self.invoice.pk, self._rows(10))
+
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.payments.count(), 11)
+        self.assertEqual(self.invoice.amount_paid, Decimal("110.00"))
+        self.assertEqual(self.invoice.status, InvoiceStatus.PARTIALLY_PAID)
+
+    def test_overpayment_rejects_whole_batch(self):
+        with self.assertRaises(ValidationError):
+            Payment.bulk_import(self.invoice.pk, self._rows(3, amount="400.00"))
+        self.assertFalse(self.invoice.payments.exists())
+
+
+class InvoiceListKeysetPaginationTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(user)
+        client = Client.objects.create(name="Test Client")
+        deal = Deal.objects.create(name="Test Deal", client=client)
+        # two invoices per day, so ties on issue_date are broken by id
+        start = date(2025, 1, 1)
+        for i in range(45):
+            Invoice.objects.create(deal=deal, issue_date=start + timedelta(days=i // 2))
+        self.newest_first = list(
+            Invoice.objects.order_by("-issue_date", "-id").values_list("pk", flat=True)
+        )
+
+    def _page(self, query=""):
+        url = reverse("sales:invoice_list")
+        response = self.client.get(f"{url}?{query}" if query else url)
+        self.assertEqual(response.status_code, 200)
+        pks = [invoice.pk for invoice in response.context["invoices"]]
+        return pks, response.context["prev_page_query"], response.context["next_page_query"]
+
+    def test_walk_forward_then_back(self):
+        pages = [self.newest_first[i:i + 20] for i in range(0, 45, 20)]
+
+        first, prev_q, next_q = self._page()
+        self.assertEqual(first, pages[0])
+        self.assertEqual(prev_q, "")
+
+        second, prev_q, next_q = self._page(next_q)
+        self.assertEqual(second, pages[1])
+        self.assertTrue(prev_q)
+
+        third, prev_q, next_q = self._page(next_q)
+        self.assertEqual(third, pages[2])
+        self.assertEqual(next_q, "")
+
+        back_second, prev_q, next_q = self._page(prev_q)
+        self.assertEqual(back_second, pages[1])
+        self.assertTrue(prev_q)
+        self.assertTrue(next_q)
+
+        back_first, prev_q, next_q = self._page(prev_q)
+        self.assertEqual(back_first, pages[0])
+        self.assertEqual(prev_q, "")
+        self.assertTrue(next_q)
+
+    def test_back_onto_first_page_after_rows_removed(self):
+        _, _, next_q = self._page()
+        _, prev_q, _ = self._page(next_q)
+
+        # newest rows deleted meanwhile: going back shows a full first page
+        Invoice.objects.filter(pk__in=self.newest_first[:5]).delete()
+        pks, prev_q, next_q = self._page(prev_q)
+        self.assertEqual(pks, self.newest_first[5:25])
+        self.assertEqual(prev_q, "")
+        self.assertTrue(next_q)
+
+    def test_stale_before_cursor_has_no_older_link(self):
+        # cursor past the oldest row: nothing older to link to
+        oldest = Invoice.objects.get(pk=self.newest_first[-1])
+        query = f"before_date={oldest.issue_date - timedelta(days=1)}&before_id=0"
+        Invoice.objects.filter(pk__in=self.newest_first[-5:]).delete()
+        pks, prev_q, next_q = self._page(query)
+        self.assertEqual(pks, self.newest_first[20:40])
+        self.assertTrue(prev_q)
+        self.assertEqual(next_q, "")
+
+
+class DocumentEmailSendTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(self.user)
+        client = Client.objects.create(name="Test Client", email="client@example.com")
+        deal = Deal.objects.create(name="Test Deal", client=client)
+        self.invoice = Invoice.objects.create(deal=deal, issue_date=date(2026, 1, 1))
+
+    @mock.patch("sales.emails.send_document_email")
+    @mock.patch("messaging.utils._background_executor")
+    def test_email_job_submitted_on_commit(self, executor, send):
+        url = reverse("sales:invoice_send_email", args=[self.invoice.pk])
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(url)
+            # nothing leaves the request before the transaction commits
+            executor.submit.assert_not_called()
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        executor.submit.assert_called_once()
 
-# Create your tests here.
+        # run the submitted job inline (without closing the test connection)
+        job = executor.submit.call_args.args[0]
+        with mock.patch("messaging.utils.connections"):
+            job()
+        send.assert_called_once_with(
+            "invoice", self.invoice.pk, "client@example.com", requested_by_id=self.user.pk
+        )
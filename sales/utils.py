@@ -0,0 +1,50 @@
+# sales/utils.py
+import json
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from services.models import Service, Package
+
+# Catalog (service/package) data cached for the proposal forms.
+# Signals clear these on any Service/Package change.
+PRICE_MAPS_CACHE_KEY = "sales:price_maps:v1"
+CATALOG_CHOICES_CACHE_KEY = "sales:catalog_choices:v1"
+CATALOG_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+
+def _get_price_maps():
+    """
+    {id: price} maps for services and packages, used by the proposal
+    item JS to pre-fill unit prices.
+    """
+    # plain tuples: no Service/Package instances built just to read two fields
+    services_price_map = {
+        str(pk): str(price or Decimal("0.00"))
+        for pk, price in Service.objects.values_list("id", "base_price").order_by("id")
+    }
+    packages_price_map = {
+        str(pk): str(price or Decimal("0.00"))
+        for pk, price in Package.objects.values_list("id", "total_price").order_by("id")
+    }
+    return services_price_map, packages_price_map
+
+
+def _build_price_maps_json():
+    services_price_map, packages_price_map = _get_price_maps()
+    return json.dumps(services_price_map), json.dumps(packages_price_map)
+
+
+def get_price_maps_json():
+    """
+    (services_json, packages_json) - serialized once and cached until a
+    Service/Package changes (see sales/signals.py).
+    """
+    return cache.get_or_set(
+        PRICE_MAPS_CACHE_KEY, _build_price_maps_json, CATALOG_CACHE_TIMEOUT
+    )
+
+
+def invalidate_catalog_caches():
+    cache.delete_many([PRICE_MAPS_CACHE_KEY, CATALOG_CHOICES_CACHE_KEY])
+
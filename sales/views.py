@@ -1,7 +1,8 @@
 # sales/views.py
 from django.db.models import Q
-from django.http import HttpResponse, Http404
-from django.template.loader import render_to_string
+from django.http import FileResponse, Http404
+from django.template.loader import get_template
+from django.utils.cache import get_conditional_response
 from django.urls import reverse, reverse_lazy
 from django.views.generic import (
     ListView,
@@ -9,12 +10,19 @@ from django.views.generic import (
     CreateView,
     UpdateView,
 )
-import json
+import os
+import tempfile
+import time
+from pathlib import Path
 from django.utils.safestring import mark_safe
-from crm.models import Client
-from common.mixins import AdminManagerMixin  # 👈 your roles mixin
+from crm.models import Client, Contact
+from common.mixins import AdminManagerMixin, ListFiltersMixin  # 👈 your roles mixin
+from common.paginators import FastPaginator
+from common.utils import search_pks
 from .forms import get_catalog_choices
+from .utils import get_price_maps_json
 from datetime import date, timedelta
+from functools import lru_cache
 
 from django.utils import timezone
 
@@ -40,54 +48,49 @@ from .forms import (
     PaymentForm,
 )
 
-from decimal import Decimal
-from services.models import Service, Package
-
 from django.contrib import messages
 from django.shortcuts import redirect, get_object_or_404
 from django.views import View
 
 from django.views.decorators.http import require_POST
 from django.utils.decorators import method_decorator
-from messaging.utils import send_templated_email
-from messaging.models import EmailTemplate
-
-
-# Optional: HTML-to-PDF with WeasyPrint (you need to install it)
-try:
-    from weasyprint import HTML
-except ImportError:  # pragma: no cover - safe fallback
-    HTML = None
+from .emails import queue_document_email
 
 
 # ============================================================================
 # Deals
 # ============================================================================
 
-class DealListView(AdminManagerMixin, ListView):
+class DealListView(AdminManagerMixin, ListFiltersMixin, ListView):
     model = Deal
     template_name = "sales/deal_list.html"
     context_object_name = "deals"
     paginate_by = 20
+    paginator_class = FastPaginator  # no COUNT(*) per page
+    filter_params = ("q", "stage", "is_active")
+
+    # every column deal_list.html renders (FK columns kept for select_related)
+    LIST_FIELDS = (
+        "id", "name", "stage", "amount", "expected_close_date", "client", "owner",
+        "client__id", "client__name", "client__display_name",
+        "owner__id", "owner__username", "owner__first_name", "owner__last_name",
+    )
 
     def get_queryset(self):
         qs = (
             super()
             .get_queryset()
-            .select_related("client")
+            .select_related("client", "owner")
+            .only(*self.LIST_FIELDS)
         )
 
-        request = self.request
-        q = request.GET.get("q")
-        stage = request.GET.get("stage")
-        is_active = request.GET.get("is_active")
+        q = self._filters["q"]
+        stage = self._filters["stage"]
+        is_active = self._filters["is_active"]
 
         # Search: deal name + client name
         if q:
-            qs = qs.filter(
-                Q(name__icontains=q)
-                | Q(client__name__icontains=q)
-            )
+            qs = qs.filter(pk__in=search_pks(Deal, q, "name", "client__name"))
 
         # Filter: Stage
         if stage:
@@ -103,11 +106,11 @@ class DealListView(AdminManagerMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        request = self.request
+        filters = self._filters
 
-        context["q"] = request.GET.get("q", "")
-        context["filter_stage"] = request.GET.get("stage", "")
-        context["filter_is_active"] = request.GET.get("is_active", "")
+        context["q"] = filters["q"]
+        context["filter_stage"] = filters["stage"]
+        context["filter_is_active"] = filters["is_active"]
 
         context["stage_choices"] = DealStage.choices
         context["is_active_choices"] = [
@@ -123,6 +126,9 @@ class DealDetailView(AdminManagerMixin, DetailView):
     template_name = "sales/deal_detail.html"
     context_object_name = "deal"
 
+    def get_queryset(self):
+        return Deal.objects.with_full_graph()
+
 
 class DealCreateView(AdminManagerMixin, CreateView):
     model = Deal
@@ -147,41 +153,36 @@ class DealUpdateView(AdminManagerMixin, UpdateView):
 # Proposals
 # ============================================================================
 
-def _get_price_maps():
-    services_price_map = {
-        str(s.id): str(s.base_price or Decimal("0.00"))
-        for s in Service.objects.all().only("id", "base_price").order_by("id")
-    }
-    packages_price_map = {
-        str(p.id): str(p.total_price or Decimal("0.00"))
-        for p in Package.objects.all().only("id", "total_price").order_by("id")
-    }
-    return services_price_map, packages_price_map
-
-class ProposalListView(AdminManagerMixin, ListView):
+class ProposalListView(AdminManagerMixin, ListFiltersMixin, ListView):
     model = Proposal
     template_name = "sales/proposal_list.html"
     context_object_name = "proposals"
     paginate_by = 20
+    paginator_class = FastPaginator  # no COUNT(*) per page
+    filter_params = ("q", "status", "deal_stage")
+
+    # every column proposal_list.html renders (FK columns kept for select_related)
+    LIST_FIELDS = (
+        "id", "title", "version", "status", "total", "deal",
+        "deal__id", "deal__name", "deal__client",
+        "deal__client__id", "deal__client__name", "deal__client__display_name",
+    )
 
     def get_queryset(self):
         qs = (
             super()
             .get_queryset()
             .select_related("deal", "deal__client")
+            .only(*self.LIST_FIELDS)
         )
 
-        request = self.request
-        q = request.GET.get("q")
-        status = request.GET.get("status")
-        deal_stage = request.GET.get("deal_stage")
+        q = self._filters["q"]
+        status = self._filters["status"]
+        deal_stage = self._filters["deal_stage"]
 
         # Search: deal name + proposal title
         if q:
-            qs = qs.filter(
-                Q(deal__name__icontains=q)
-                | Q(title__icontains=q)
-            )
+            qs = qs.filter(pk__in=search_pks(Proposal, q, "title", "deal__name"))
 
         # Filter: Proposal status
         if status:
@@ -195,11 +196,11 @@ class ProposalListView(AdminManagerMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        request = self.request
+        filters = self._filters
 
-        context["q"] = request.GET.get("q", "")
-        context["filter_status"] = request.GET.get("status", "")
-        context["filter_deal_stage"] = request.GET.get("deal_stage", "")
+        context["q"] = filters["q"]
+        context["filter_status"] = filters["status"]
+        context["filter_deal_stage"] = filters["deal_stage"]
 
         context["status_choices"] = ProposalStatus.choices
         context["deal_stage_choices"] = DealStage.choices
@@ -211,6 +212,9 @@ class ProposalDetailView(AdminManagerMixin, DetailView):
     template_name = "sales/proposal_detail.html"
     context_object_name = "proposal"
 
+    def get_queryset(self):
+        return Proposal.objects.with_full_graph()
+
 
 class ProposalCreateView(AdminManagerMixin, CreateView):
     model = Proposal
@@ -228,43 +232,49 @@ class ProposalCreateView(AdminManagerMixin, CreateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        services_price_map, packages_price_map = _get_price_maps()
-        context["services_price_map_json"] = mark_safe(json.dumps(services_price_map))
-        context["packages_price_map_json"] = mark_safe(json.dumps(packages_price_map))
-
-        catalog_choices = get_catalog_choices()
+        services_json, packages_json = get_price_maps_json()
+        context["services_price_map_json"] = mark_safe(services_json)
+        context["packages_price_map_json"] = mark_safe(packages_json)
 
-        if self.request.method == "POST":
+        if "item_formset" not in context:
             proposal_instance = getattr(context.get("form"), "instance", None)
-            context["item_formset"] = ProposalItemFormSet(
-                self.request.POST,
+            context["item_formset"] = self._build_item_formset(
+                post=self.request.method == "POST",
                 instance=proposal_instance,
-                catalog_choices=catalog_choices,
-            )
-        else:
-            context["item_formset"] = ProposalItemFormSet(
-                catalog_choices=catalog_choices
             )
 
         return context
 
+    def _build_item_formset(self, post=True, instance=None):
+        return ProposalItemFormSet(
+            self.request.POST if post else None,
+            instance=instance,
+            catalog_choices=self._catalog_choices(),
+        )
+
+    def _catalog_choices(self):
+        # built once per request, however many formsets get instantiated
+        if not hasattr(self, "_catalog_choices_cache"):
+            self._catalog_choices_cache = get_catalog_choices()
+        return self._catalog_choices_cache
 
     def form_valid(self, form):
         form.instance.owner = self.request.user
 
-        context = self.get_context_data(form=form)
-        item_formset = context["item_formset"]
+        # only the formset here; the full context is built just on errors
+        item_formset = self._build_item_formset(instance=form.instance)
 
         if not item_formset.is_valid():
-            return self.render_to_response(context)
+            return self.render_to_response(
+                self.get_context_data(form=form, item_formset=item_formset)
+            )
 
         self.object = form.save()
 
         item_formset.instance = self.object
-        item_formset.save()
-
-        # ✅ Always compute totals from items
-        self.object.recalculate_totals(save=True)
+        # ✅ Always compute totals from items (once, after all rows are saved)
+        with self.object.defer_recalc():
+            item_formset.save()
 
         return super().form_valid(form)
 
@@ -279,42 +289,45 @@ class ProposalUpdateView(AdminManagerMixin, UpdateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        services_price_map, packages_price_map = _get_price_maps()
-        context["services_price_map_json"] = mark_safe(json.dumps(services_price_map))
-        context["packages_price_map_json"] = mark_safe(json.dumps(packages_price_map))
-
-        catalog_choices = get_catalog_choices()
+        services_json, packages_json = get_price_maps_json()
+        context["services_price_map_json"] = mark_safe(services_json)
+        context["packages_price_map_json"] = mark_safe(packages_json)
 
-        proposal = self.object
-        if self.request.method == "POST":
-            context["item_formset"] = ProposalItemFormSet(
-                self.request.POST,
-                instance=proposal,
-                catalog_choices=catalog_choices,
-            )
-        else:
-            context["item_formset"] = ProposalItemFormSet(
-                instance=proposal,
-                catalog_choices=catalog_choices,
+        if "item_formset" not in context:
+            context["item_formset"] = self._build_item_formset(
+                post=self.request.method == "POST"
             )
 
         return context
 
+    def _build_item_formset(self, post=True):
+        return ProposalItemFormSet(
+            self.request.POST if post else None,
+            instance=self.object,
+            catalog_choices=self._catalog_choices(),
+        )
+
+    def _catalog_choices(self):
+        # built once per request, however many formsets get instantiated
+        if not hasattr(self, "_catalog_choices_cache"):
+            self._catalog_choices_cache = get_catalog_choices()
+        return self._catalog_choices_cache
 
     def form_valid(self, form):
-        context = self.get_context_data(form=form)
-        item_formset = context["item_formset"]
+        # only the formset here; the full context is built just on errors
+        item_formset = self._build_item_formset()
 
         if not item_formset.is_valid():
-            return self.render_to_response(context)
+            return self.render_to_response(
+                self.get_context_data(form=form, item_formset=item_formset)
+            )
 
         self.object = form.save()
 
         item_formset.instance = self.object
-        item_formset.save()
-
-        # ✅ Always compute totals from items
-        self.object.recalculate_totals(save=True)
+        # ✅ Always compute totals from items (once, after all rows are saved)
+        with self.object.defer_recalc():
+            item_formset.save()
 
         return super().form_valid(form)
 
@@ -324,30 +337,36 @@ class ProposalUpdateView(AdminManagerMixin, UpdateView):
 # Contracts
 # ============================================================================
 
-class ContractListView(AdminManagerMixin, ListView):
+class ContractListView(AdminManagerMixin, ListFiltersMixin, ListView):
     model = Contract
     template_name = "sales/contract_list.html"
     context_object_name = "contracts"
     paginate_by = 20
+    paginator_class = FastPaginator  # no COUNT(*) per page
+    filter_params = ("q", "status", "deal_stage")
+
+    # every column contract_list.html renders (FK columns kept for select_related)
+    LIST_FIELDS = (
+        "id", "number", "status", "signed_date", "start_date", "end_date", "deal",
+        "deal__id", "deal__name", "deal__client",
+        "deal__client__id", "deal__client__name", "deal__client__display_name",
+    )
 
     def get_queryset(self):
         qs = (
             super()
             .get_queryset()
-            .select_related("deal", "proposal", "deal__client")
+            .select_related("deal", "deal__client")
+            .only(*self.LIST_FIELDS)
         )
 
-        request = self.request
-        q = request.GET.get("q")
-        status = request.GET.get("status")
-        deal_stage = request.GET.get("deal_stage")
+        q = self._filters["q"]
+        status = self._filters["status"]
+        deal_stage = self._filters["deal_stage"]
 
         # Search: contract number + deal name
         if q:
-            qs = qs.filter(
-                Q(number__icontains=q)
-                | Q(deal__name__icontains=q)
-            )
+            qs = qs.filter(pk__in=search_pks(Contract, q, "number", "deal__name"))
 
         # Filter: Contract status
         if status:
@@ -361,11 +380,11 @@ class ContractListView(AdminManagerMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        request = self.request
+        filters = self._filters
 
-        context["q"] = request.GET.get("q", "")
-        context["filter_status"] = request.GET.get("status", "")
-        context["filter_deal_stage"] = request.GET.get("deal_stage", "")
+        context["q"] = filters["q"]
+        context["filter_status"] = filters["status"]
+        context["filter_deal_stage"] = filters["deal_stage"]
 
         context["status_choices"] = ContractStatus.choices
         context["deal_stage_choices"] = DealStage.choices
@@ -377,6 +396,9 @@ class ContractDetailView(AdminManagerMixin, DetailView):
     template_name = "sales/contract_detail.html"
     context_object_name = "contract"
 
+    def get_queryset(self):
+        return Contract.objects.with_full_graph()
+
 
 class ContractCreateView(AdminManagerMixin, CreateView):
     model = Contract
@@ -431,62 +453,70 @@ class ContractUpdateView(AdminManagerMixin, UpdateView):
 # Invoices
 # ============================================================================
 
-class InvoiceListView(AdminManagerMixin, ListView):
+@lru_cache(maxsize=32)
+def _period_dates(period_key: str, today: date):
+    """
+    Returns (start_date, end_date) inclusive, or (None, None) if no period filter.
+    Pure date math, so it is memoized per (period, day).
+    """
+    if period_key == "this_month":
+        start = today.replace(day=1)
+        end = today
+        return start, end
+
+    if period_key == "last_month":
+        first_this = today.replace(day=1)
+        last_prev = first_this - timedelta(days=1)
+        start_prev = last_prev.replace(day=1)
+        return start_prev, last_prev
+
+    if period_key == "last_3_months":
+        # From first day of the month 2 months ago up to today
+        first_this = today.replace(day=1)
+        approx = first_this - timedelta(days=62)  # safely reaches ~2 months back
+        start = approx.replace(day=1)
+        end = today
+        return start, end
+
+    if period_key == "last_year":
+        # previous calendar year: Jan 1 .. Dec 31 of last year
+        start = date(today.year - 1, 1, 1)
+        end = date(today.year - 1, 12, 31)
+        return start, end
+
+    return None, None
+
+
+class InvoiceListView(AdminManagerMixin, ListFiltersMixin, ListView):
     model = Invoice
     template_name = "sales/invoice_list.html"
     context_object_name = "invoices"
     paginate_by = 20
+    filter_params = ("q", "status", "period")
 
-    def _get_period_dates(self, period_key: str):
-        """
-        Returns (start_date, end_date) inclusive, or (None, None) if no period filter.
-        """
-        today = timezone.localdate()
-
-        if period_key == "this_month":
-            start = today.replace(day=1)
-            end = today
-            return start, end
-
-        if period_key == "last_month":
-            first_this = today.replace(day=1)
-            last_prev = first_this - timedelta(days=1)
-            start_prev = last_prev.replace(day=1)
-            return start_prev, last_prev
-
-        if period_key == "last_3_months":
-            # From first day of the month 2 months ago up to today
-            first_this = today.replace(day=1)
-            approx = first_this - timedelta(days=62)  # safely reaches ~2 months back
-            start = approx.replace(day=1)
-            end = today
-            return start, end
-
-        if period_key == "last_year":
-            # previous calendar year: Jan 1 .. Dec 31 of last year
-            start = date(today.year - 1, 1, 1)
-            end = date(today.year - 1, 12, 31)
-            return start, end
-
-        return None, None
+    # every column invoice_list.html renders (FK columns kept for select_related)
+    LIST_FIELDS = (
+        "id", "number", "issue_date", "status", "total", "amount_paid", "deal",
+        "deal__id", "deal__name", "deal__client",
+        "deal__client__id", "deal__client__name", "deal__client__display_name",
+    )
 
     def get_queryset(self):
         qs = (
             super()
             .get_queryset()
             .select_related("deal", "deal__client")
+            .only(*self.LIST_FIELDS)
         )
 
-        request = self.request
-        q = (request.GET.get("q") or "").strip()
-        status = (request.GET.get("status") or "").strip()
-        period = (request.GET.get("period") or "").strip()  # ✅ new
+        q = self._filters["q"]
+        status = self._filters["status"]
+        period = self._filters["period"]  # ✅ new
 
         # Search: invoice number + client name
         if q:
             qs = qs.filter(
-                Q(number__icontains=q)
-                | Q(deal__client__name__icontains=q)
+                pk__in=search_pks(Invoice, q, "number", "deal__client__name")
             )
 
         # Filter: status
@@ -494,19 +524,100 @@ class InvoiceListView(AdminManagerMixin, ListView):
             qs = qs.filter(status=status)
 
         # ✅ Filter: period (issue_date)
-        start_date, end_date = self._get_period_dates(period)
+        # request.today is set by ui.middleware.TodayMiddleware
+        today = getattr(self.request, "today", None) or timezone.localdate()
+        start_date, end_date = _period_dates(period, today)
         if start_date and end_date:
             qs = qs.filter(issue_date__gte=start_date, issue_date__lte=end_date)
 
         return qs.order_by("-issue_date", "-id")
 
+    # ---------- Keyset pagination on (issue_date, id) ---------- #
+    def paginate_queryset(self, queryset, page_size):
+        """
+        No COUNT(*) and no OFFSET: each page starts right after (or before)
+        the last row shown, so deep pages are an index range scan.
+        ?after_date=&after_id= -> older invoices,
+        ?before_date=&before_id= -> newer invoices.
+        """
+        before = self._get_cursor("before")
+        after = self._get_cursor("after")
+
+        rows = None
+        if before:
+            d, pk = before
+            rows = list(
+                queryset
+                .filter(Q(issue_date__gt=d) | Q(issue_date=d, id__gt=pk))
+                .order_by("issue_date", "id")[: page_size + 1]
+            )
+            has_newer = len(rows) > page_size
+            if has_newer:
+                rows = rows[:page_size][::-1]
+                # the cursor row may be gone or filtered out: check, don't assume
+                has_older = queryset.filter(
+                    Q(issue_date__lt=d) | Q(issue_date=d, id__lte=pk)
+                ).exists()
+            else:
+                # back at the newest end: serve the regular (full) first page
+                rows = None
+                after = None
+
+        if rows is None:
+            if after:
+                d, pk = after
+                queryset = queryset.filter(
+                    Q(issue_date__lt=d) | Q(issue_date=d, id__lt=pk)
+                )
+            rows = list(queryset[: page_size + 1])
+            has_older = len(rows) > page_size
+            rows = rows[:page_size]
+            has_newer = after is not None
+
+        self.next_page_query = (
+            self._page_query("after", rows[-1]) if rows and has_older else ""
+        )
+        self.prev_page_query = (
+            self._page_query("before", rows[0]) if rows and has_newer else ""
+        )
+        is_paginated = bool(self.next_page_query or self.prev_page_query)
+        return None, None, rows, is_paginated
+
+    def _get_cursor(self, direction):
+        """
+        (issue_date, id) from ?<direction>_date=&<direction>_id=, or None.
+        """
+        raw_date = self.request.GET.get(f"{direction}_date")
+        raw_id = self.request.GET.get(f"{direction}_id")
+        if not raw_date or not raw_id:
+            return None
+        try:
+            return date.fromisoformat(raw_date), int(raw_id)
+        except ValueError:
+            return None
+
+    def _page_query(self, direction, invoice):
+        """
+        Current filters + a cursor pointing at `invoice`.
+        """
+        params = self.request.GET.copy()
+        for key in ("page", "after_date", "after_id", "before_date", "before_id"):
+            params.pop(key, None)
+        params[f"{direction}_date"] = invoice.issue_date.isoformat()
+        params[f"{direction}_id"] = invoice.pk
+        return params.urlencode()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        request = self.request
+        filters = self._filters
+
+        context["q"] = filters["q"]
+        context["filter_status"] = filters["status"]
+        context["filter_period"] = filters["period"]  # ✅
 
-        context["q"] = request.GET.get("q", "")
-        context["filter_status"] = request.GET.get("status", "")
-        context["filter_period"] = request.GET.get("period", "")  # ✅
+        # keyset pagination links (see paginate_queryset)
+        context["next_page_query"] = self.next_page_query
+        context["prev_page_query"] = self.prev_page_query
 
         context["status_choices"] = InvoiceStatus.choices
 
@@ -527,6 +638,9 @@ class InvoiceDetailView(AdminManagerMixin, DetailView):
     template_name = "sales/invoice_detail.html"
     context_object_name = "invoice"
 
+    def get_queryset(self):
+        return Invoice.objects.with_full_graph()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         invoice = self.object
@@ -565,20 +679,20 @@ class InvoiceCreateView(AdminManagerMixin, CreateView):
             or self.request.GET.get("contract")
         )
 
+        # populate_from_contract only needs the pk and deal_id
+        contracts = Contract.objects.filter(deal_id=invoice.deal_id).only("id", "deal")
+
         if contract_id:
             try:
-                contract = Contract.objects.get(
-                    pk=contract_id,
-                    deal=invoice.deal,
-                )
-            except Contract.DoesNotExist:
+                contract = contracts.get(pk=contract_id)
+            except (Contract.DoesNotExist, ValueError):
                 contract = None
 
         if contract is None:
             # If you really want only signed contracts, keep the filter:
-            # qs = invoice.deal.contracts.filter(status=ContractStatus.SIGNED)
-            qs = invoice.deal.contracts.all()  # 👈 less strict, uses latest contract
-            contract = qs.order_by("-signed_date", "-created_at").first()
+            # contracts = contracts.filter(status=ContractStatus.SIGNED)
+            # 👈 less strict, uses latest contract (served by the deal/signed_date index)
+            contract = contracts.order_by("-signed_date", "-created_at").first()
 
         return contract
 
@@ -607,6 +721,43 @@ class InvoiceUpdateView(AdminManagerMixin, UpdateView):
 # Invoice PDF Download
 # ============================================================================
 
+# Rendered invoice PDFs, one file per (invoice, deal, client) version.
+# Shared by all workers on the host; files older than the timeout are
+# ignored and swept on the next render.
+INVOICE_PDF_CACHE_DIR = Path(tempfile.gettempdir()) / "oceanclouds_invoice_pdf"
+INVOICE_PDF_CACHE_TIMEOUT = 60 * 60 * 24  # 1 day
+
+
+def _open_cached_pdf(path):
+    """
+    Open a cached PDF if it exists and is still fresh, else None.
+    """
+    try:
+        pdf_file = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    if os.fstat(pdf_file.fileno()).st_mtime < time.time() - INVOICE_PDF_CACHE_TIMEOUT:
+        pdf_file.close()
+        return None
+    return pdf_file
+
+
+def _prune_invoice_pdfs(invoice_pk, keep):
+    """
+    Remove older versions of this invoice's PDF, plus any file past the
+    timeout (deleted invoices, abandoned temp files).
+    """
+    cutoff = time.time() - INVOICE_PDF_CACHE_TIMEOUT
+    for path in INVOICE_PDF_CACHE_DIR.iterdir():
+        if path == keep:
+            continue
+        try:
+            if path.name.startswith(f"{invoice_pk}-") or path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass
+
+
 class InvoicePDFDownloadView(AdminManagerMixin, DetailView):
     """
     Generates a PDF from the invoice HTML template and returns it as a download.
@@ -616,27 +767,76 @@ class InvoicePDFDownloadView(AdminManagerMixin, DetailView):
     model = Invoice
 
     def get(self, request, *args, **kwargs):
-        if HTML is None:
+        # Optional: HTML-to-PDF with WeasyPrint (you need to install it).
+        # Imported here so workers that never render PDFs don't load it.
+        try:
+            from weasyprint import HTML
+        except ImportError:  # pragma: no cover - safe fallback
             # WeasyPrint not installed – fail gracefully
             raise Http404("PDF generation is not available. Install WeasyPrint.")
 
-        invoice = self.get_object()
-
-        html_string = render_to_string(
-            "sales/invoice_pdf.html",
-            {"invoice": invoice},
-            request=request,
+        # Cheap lookup first: enough for the cache key / ETag.
+        # Item and payment changes bump invoice.updated_at; the PDF also
+        # shows deal and client fields, so their updated_at is part of it too.
+        invoice = self.get_object(
+            queryset=Invoice.objects.select_related("deal__client").only(
+                "id", "number", "updated_at",
+                "deal__updated_at", "deal__client__updated_at",
+            )
+        )
+        stamps = "-".join(
+            f"{ts.timestamp():.6f}"
+            for ts in (
+                invoice.updated_at,
+                invoice.deal.updated_at,
+                invoice.deal.client.updated_at,
+            )
         )
+        version = f"{invoice.pk}-{stamps}"
+        etag = f'"invoice_pdf:{version}"'
+
+        # Browser already has this version -> 304, nothing rendered
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        pdf_path = INVOICE_PDF_CACHE_DIR / f"{version}.pdf"
+        pdf_file = _open_cached_pdf(pdf_path)
+        if pdf_file is None:
+            full_invoice = self.get_object(queryset=Invoice.objects.with_full_graph())
+
+            # the cached template loader hands back the compiled template
+            html_string = get_template("sales/invoice_pdf.html").render(
+                {"invoice": full_invoice}, request
+            )
 
-        pdf_file = HTML(
-            string=html_string,
-            base_url=request.build_absolute_uri(),
-        ).write_pdf()
+            # WeasyPrint writes straight to disk (no PDF-sized bytes in memory);
+            # rename into place so a concurrent download never sees half a file
+            INVOICE_PDF_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=INVOICE_PDF_CACHE_DIR, suffix=".tmp", delete=False
+            ) as tmp:
+                HTML(
+                    string=html_string,
+                    base_url=request.build_absolute_uri(),
+                ).write_pdf(target=tmp)
+
+            # Hold our own handle before anything is renamed or pruned, so
+            # another worker sweeping the directory can't pull the file away
+            pdf_file = open(tmp.name, "rb")
+            os.replace(tmp.name, pdf_path)
+            _prune_invoice_pdfs(invoice.pk, keep=pdf_path)
 
         filename = f"invoice_{invoice.number or invoice.pk}.pdf"
 
-        response = HttpResponse(pdf_file, content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        # streamed in chunks; FileResponse closes the file when done
+        response = FileResponse(
+            pdf_file,
+            as_attachment=True,
+            filename=filename,
+            content_type="application/pdf",
+        )
+        response["ETag"] = etag
         return response
 
 
@@ -644,29 +844,40 @@ class InvoicePDFDownloadView(AdminManagerMixin, DetailView):
 # Payments
 # ============================================================================
 
-class PaymentListView(AdminManagerMixin, ListView):
+class PaymentListView(AdminManagerMixin, ListFiltersMixin, ListView):
     model = Payment
     template_name = "sales/payment_list.html"
     context_object_name = "payments"
     paginate_by = 20
+    paginator_class = FastPaginator  # no COUNT(*) per page
+    filter_params = ("q", "method", "payment_type")
+
+    # every column payment_list.html renders (FK columns kept for select_related)
+    LIST_FIELDS = (
+        "id", "date", "amount", "method", "payment_type", "invoice",
+        "invoice__id", "invoice__number", "invoice__deal",
+        "invoice__deal__id", "invoice__deal__name", "invoice__deal__client",
+        "invoice__deal__client__id",
+        "invoice__deal__client__name",
+        "invoice__deal__client__display_name",
+    )
 
     def get_queryset(self):
         qs = (
             super()
             .get_queryset()
             .select_related("invoice", "invoice__deal", "invoice__deal__client")
+            .only(*self.LIST_FIELDS)
         )
 
-        request = self.request
-        q = request.GET.get("q")
-        method = request.GET.get("method")
-        payment_type = request.GET.get("payment_type")
+        q = self._filters["q"]
+        method = self._filters["method"]
+        payment_type = self._filters["payment_type"]
 
         # Search: invoice number + reference
         if q:
             qs = qs.filter(
-                Q(invoice__number__icontains=q)
-                | Q(reference__icontains=q)
+                pk__in=search_pks(Payment, q, "reference", "invoice__number")
             )
 
         # Filter: Payment method
@@ -681,11 +892,11 @@ class PaymentListView(AdminManagerMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        request = self.request
+        filters = self._filters
 
-        context["q"] = request.GET.get("q", "")
-        context["filter_method"] = request.GET.get("method", "")
-        context["filter_payment_type"] = request.GET.get("payment_type", "")
+        context["q"] = filters["q"]
+        context["filter_method"] = filters["method"]
+        context["filter_payment_type"] = filters["payment_type"]
 
         context["method_choices"] = PaymentMethod.choices
         context["payment_type_choices"] = PaymentType.choices
@@ -744,36 +955,23 @@ def _resolve_client_email(client) -> str:
     if email:
         return email
 
-    primary = getattr(client, "primary_contact", None)
-    if primary:
-        primary_email = (getattr(primary, "email", "") or "").strip()
-        if primary_email:
-            return primary_email
-
-    return ""
-
-
-def _flash_send_result(request, label, to_email, result, extra_tags=""):
-    if getattr(result, "ok", False):
-        messages.success(
-            request,
-            f"{label} email sent to {to_email}.",
-            extra_tags=extra_tags,
-        )
-    else:
-        error_msg = getattr(result, "error", None) or "Email send failed."
-        messages.error(
-            request,
-            f"{label} email failed: {error_msg}",
-            extra_tags=extra_tags,
-        )
-
+    # Client.primary_contact is a property (a query), not an FK, so it can't be
+    # select_related; fetch just the email column, and only when needed.
+    primary_email = (
+        Contact.objects
+        .filter(client_id=client.pk, is_primary=True)
+        .exclude(email="")
+        .order_by("first_name")  # Contact.Meta ordering, minus the client join
+        .values_list("email", flat=True)
+        .first()
+    )
+    return (primary_email or "").strip()
 
 
 @method_decorator(require_POST, name="dispatch")
 class ProposalSendEmailView(AdminManagerMixin, View):
     """
-    Send proposal email immediately using default PROPOSAL template.
+    Send proposal email in the background using default PROPOSAL template.
     """
     def post(self, request, pk: int):
         proposal = get_object_or_404(
@@ -793,21 +991,11 @@ class ProposalSendEmailView(AdminManagerMixin, View):
             )
             return redirect("sales:proposal_detail", pk=proposal.pk)
 
-        result = send_templated_email(
-            template_type=EmailTemplate.TemplateType.PROPOSAL,
-            to_emails=to_email,
-            context={
-                "proposal": proposal,
-                "deal": deal,
-                "client": client,
-            },
-        )
-
-        _flash_send_result(
+        # sent after the response; failures come back as a notification
+        queue_document_email("proposal", proposal.pk, to_email, requested_by=request.user)
+        messages.info(
             request,
-            label="Proposal",
-            to_email=to_email,
-            result=result,
+            f"Sending proposal email to {to_email}. You'll get a notification if it fails.",
             extra_tags="scope:proposal scope:email",
         )
         return redirect("sales:proposal_detail", pk=proposal.pk)
@@ -816,7 +1004,7 @@ class ProposalSendEmailView(AdminManagerMixin, View):
 @method_decorator(require_POST, name="dispatch")
 class ContractSendEmailView(AdminManagerMixin, View):
     """
-    Send contract email immediately using default CONTRACT template.
+    Send contract email in the background using default CONTRACT template.
     """
     def post(self, request, pk: int):
         contract = get_object_or_404(
@@ -836,22 +1024,11 @@ class ContractSendEmailView(AdminManagerMixin, View):
             )
             return redirect("sales:contract_detail", pk=contract.pk)
 
-        result = send_templated_email(
-            template_type=EmailTemplate.TemplateType.CONTRACT,
-            to_emails=to_email,
-            context={
-                "contract": contract,
-                "proposal": contract.proposal,
-                "deal": deal,
-                "client": client,
-            },
-        )
-
-        _flash_send_result(
+        # sent after the response; failures come back as a notification
+        queue_document_email("contract", contract.pk, to_email, requested_by=request.user)
+        messages.info(
             request,
-            label="Contract",
-            to_email=to_email,
-            result=result,
+            f"Sending contract email to {to_email}. You'll get a notification if it fails.",
             extra_tags="scope:contract scope:email",
         )
         return redirect("sales:contract_detail", pk=contract.pk)
@@ -860,11 +1037,11 @@ class ContractSendEmailView(AdminManagerMixin, View):
 @method_decorator(require_POST, name="dispatch")
 class InvoiceSendEmailView(AdminManagerMixin, View):
     """
-    Send invoice email immediately using default INVOICE template.
+    Send invoice email in the background using default INVOICE template.
     """
     def post(self, request, pk: int):
         invoice = get_object_or_404(
-            Invoice.objects.select_related("deal", "deal__client", "contract"),
+            Invoice.objects.select_related("deal", "deal__client"),
             pk=pk,
         )
 
@@ -880,22 +1057,11 @@ class InvoiceSendEmailView(AdminManagerMixin, View):
             )
             return redirect("sales:invoice_detail", pk=invoice.pk)
 
-        result = send_templated_email(
-            template_type=EmailTemplate.TemplateType.INVOICE,
-            to_emails=to_email,
-            context={
-                "invoice": invoice,
-                "deal": deal,
-                "client": client,
-                "contract": getattr(invoice, "contract", None),
-            },
-        )
-
-        _flash_send_result(
+        # sent after the response; failures come back as a notification
+        queue_document_email("invoice", invoice.pk, to_email, requested_by=request.user)
+        messages.info(
             request,
-            label="Invoice",
-            to_email=to_email,
-            result=result,
+            f"Sending invoice email to {to_email}. You'll get a notification if it fails.",
             extra_tags="scope:invoice scope:email",
         )
         return redirect("sales:invoice_detail", pk=invoice.pk)
@@ -904,7 +1070,7 @@ class InvoiceSendEmailView(AdminManagerMixin, View):
 @method_decorator(require_POST, name="dispatch")
 class PaymentSendEmailView(AdminManagerMixin, View):
     """
-    Send payment receipt email immediately using default PAYMENT template.
+    Send payment receipt email in the background using default PAYMENT template.
     """
     def post(self, request, pk: int):
         payment = get_object_or_404(
@@ -925,22 +1091,11 @@ class PaymentSendEmailView(AdminManagerMixin, View):
             )
             return redirect("sales:payment_detail", pk=payment.pk)
 
-        result = send_templated_email(
-            template_type=EmailTemplate.TemplateType.PAYMENT,
-            to_emails=to_email,
-            context={
-                "payment": payment,
-                "invoice": invoice,
-                "deal": deal,
-                "client": client,
-            },
-        )
-
-        _flash_send_result(
+        # sent after the response; failures come back as a notification
+        queue_document_email("payment", payment.pk, to_email, requested_by=request.user)
+        messages.info(
             request,
-            label="Payment",
-            to_email=to_email,
-            result=result,
+            f"Sending payment email to {to_email}. You'll get a notification if it fails.",
             extra_tags="scope:payment scope:email",
         )
         return redirect("sales:payment_detail", pk=payment.pk)
@@ -2,37 +2,9 @@
 from django import forms
 from django.forms import inlineformset_factory
 
-from .models import Vendor, Service, Package, PackageItem, InventoryItem
-
-
-class BootstrapModelForm(forms.ModelForm):
-    """
-    Base form to automatically add Bootstrap classes to widgets.
-    - Text / number / email / URL / textarea / date => form-control
-    - Select / ModelChoiceField / ModelMultipleChoiceField => form-select
-    - Checkbox => form-check-input
-    """
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        for name, field in self.fields.items():
-            widget = field.widget
+from common.forms import BootstrapModelForm
 
-            # Keep any existing classes
-            existing_classes = widget.attrs.get("class", "")
-
-            # Checkbox
-            if isinstance(widget, forms.CheckboxInput):
-                widget.attrs["class"] = (existing_classes + " form-check-input").strip()
-
-            # Selects (ChoiceField, ModelChoiceField, Multiple select, etc.)
-            elif isinstance(widget, (forms.Select, forms.SelectMultiple)):
-                widget.attrs["class"] = (existing_classes + " form-select").strip()
-
-            # Everything else → form-control
-            else:
-                widget.attrs["class"] = (existing_classes + " form-control").strip()
+from .models import Vendor, Service, Package, PackageItem, InventoryItem
 
 
 class VendorForm(BootstrapModelForm):
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0005_alter_inventoryitem_owner_alter_package_owner_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inventoryitem',
+            index=models.Index(fields=['service', 'quantity_available'], name='services_in_service_2b6ddf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='package',
+            index=models.Index(fields=['is_active', 'name'], name='services_pa_is_acti_add388_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['category', 'is_active', 'name'], name='services_se_categor_79641e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['vendor_type', 'is_preferred', 'name'], name='services_ve_vendor__eca99f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['name'], name='services_ve_name_843d63_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Trigram GIN indexes for the services list-view search (PostgreSQL only).
+
+from django.db import migrations
+
+
+# (index name, table, column) - columns hit by `icontains` in services/views.py.
+TRIGRAM_INDEXES = [
+    ("services_vendor_name_trgm", "services_vendor", "name"),
+    ("services_vendor_company_name_trgm", "services_vendor", "company_name"),
+    ("services_service_name_trgm", "services_service", "name"),
+    ("services_service_code_trgm", "services_service", "code"),
+    ("services_package_name_trgm", "services_package", "name"),
+    ("services_package_code_trgm", "services_package", "code"),
+    ("services_inventoryitem_name_trgm", "services_inventoryitem", "name"),
+    ("services_inventoryitem_sku_trgm", "services_inventoryitem", "sku"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    With pg_trgm, Postgres serves `ILIKE '%q%'` (Django's icontains) from a
+    GIN index instead of a sequential scan. SQLite has no equivalent: no-op.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} "
+            f"ON {table} USING gin ({column} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0006_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 08:23
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0007_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='packageitem',
+            name='line_total',
+        ),
+        migrations.AddField(
+            model_name='packageitem',
+            name='line_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('unit_price'), '*', models.F('quantity')), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+    ]
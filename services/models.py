@@ -1,12 +1,31 @@
 # services/models.py
-from django.db import models
-from django.db.models import Sum
+from django.db import connection, models, transaction
+from django.db.models import F, IntegerField, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Substr
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from common.models import TimeStamped, Owned
 
 
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+
+def _lock_code_prefix(prefix: str) -> None:
+    """
+    Serialize code generation for one prefix until the transaction ends.
+
+    On PostgreSQL this takes a transaction-scoped advisory lock so concurrent
+    creates wait instead of colliding on the unique code. SQLite already
+    serializes writers, so nothing is needed there.
+    """
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [prefix])
+
+
 # -------------------------------------------------------------------
 # Choice enums
 # -------------------------------------------------------------------
@@ -73,6 +92,11 @@ class Vendor(TimeStamped, Owned):
 
     class Meta:
         ordering = ("name",)
+        indexes = [
+            # vendor list: type / preferred filters, ordered by name
+            models.Index(fields=["vendor_type", "is_preferred", "name"]),
+            models.Index(fields=["name"]),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -126,6 +150,10 @@ class Service(TimeStamped, Owned):
 
     class Meta:
         ordering = ("name",)
+        indexes = [
+            # service list: category / active filters, ordered by name
+            models.Index(fields=["category", "is_active", "name"]),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -138,36 +166,32 @@ class Service(TimeStamped, Owned):
     def _generate_next_code(cls) -> str:
         """
         Generate the next sequential service code like SER001, SER002, ...
-        Looks at the highest existing code starting with the prefix.
+        Takes the numeric MAX of existing suffixes in SQL, so SER1000 still
+        sorts after SER999.
         """
         prefix = cls.CODE_PREFIX
         pad = cls.CODE_PAD
 
-        last = (
+        # Only purely numeric suffixes count; free-text codes are ignored
+        # so the cast never sees a non-number.
+        number = (
             cls.objects
-            .filter(code__startswith=prefix)
-            .order_by("-code")
-            .only("code")
-            .first()
+            .filter(code__startswith=prefix, code__regex=rf"^{prefix}[0-9]+$")
+            .annotate(_n=Cast(Substr("code", len(prefix) + 1), IntegerField()))
+            .aggregate(m=Max("_n"))["m"]
+            or 0
         )
 
-        if last and last.code:
-            # Extract numeric part; ignore any weird codes safely
-            suffix = last.code.replace(prefix, "")
-            try:
-                number = int(suffix)
-            except ValueError:
-                number = 0
-        else:
-            number = 0
-
         return f"{prefix}{number + 1:0{pad}d}"
 
     def save(self, *args, **kwargs):
         # Only auto-generate if no code provided
-        if not self.code:
+        if self.code:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            _lock_code_prefix(self.CODE_PREFIX)
             self.code = self._generate_next_code()
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
 
 
 # -------------------------------------------------------------------
@@ -203,6 +227,10 @@ class Package(TimeStamped, Owned):
 
     class Meta:
         ordering = ("name",)
+        indexes = [
+            # package list: active filter, ordered by name
+            models.Index(fields=["is_active", "name"]),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -210,15 +238,45 @@ class Package(TimeStamped, Owned):
     def get_absolute_url(self):
         return reverse("services:package_detail", args=[self.pk])
 
-    def recalculate_total(self, save: bool = True):
+    def recalculate_total(self, save: bool = True, refresh: bool = True):
         """
         Sum all line_totals from items and update total_price.
+        With save=True this is a single UPDATE ... SET total_price = (SELECT
+        SUM(...)); pass refresh=False when the new total isn't needed on
+        this instance, to skip reading it back.
         """
-        total = self.items.aggregate(total=Sum("line_total"))["total"] or 0
-        self.total_price = total
-        if save:
-            self.save(update_fields=["total_price"])
-        return total
+        if not save:
+            total = self.items.aggregate(total=Sum("line_total"))["total"] or 0
+            self.total_price = total
+            return total
+
+        item_totals = (
+            PackageItem.objects
+            .filter(package=OuterRef("pk"))
+            .values("package")
+            .annotate(t=Sum("line_total"))
+            .values("t")
+        )
+        Package.objects.filter(pk=self.pk).update(
+            total_price=Coalesce(
+                Subquery(item_totals),
+                Value(0),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2),
+            )
+        )
+
+        # update() skips post_save, which is what normally clears the cached
+        # sales price maps and services list rows built from total_price
+        # (after commit, so readers of the old total can't re-cache it)
+        from sales.utils import invalidate_catalog_caches  # local import to avoid circular issues
+        from .utils import bump_list_cache_version
+        transaction.on_commit(invalidate_catalog_caches)
+        transaction.on_commit(bump_list_cache_version)
+
+        if not refresh:
+            return None
+        self.refresh_from_db(fields=["total_price"])
+        return self.total_price
 
     # ---------- Code generation ---------- #
     @classmethod
@@ -229,30 +287,26 @@ class Package(TimeStamped, Owned):
         prefix = cls.CODE_PREFIX
         pad = cls.CODE_PAD
 
-        last = (
+        # Only purely numeric suffixes count; free-text codes are ignored
+        # so the cast never sees a non-number.
+        number = (
             cls.objects
-            .filter(code__startswith=prefix)
-            .order_by("-code")
-            .only("code")
-            .first()
+            .filter(code__startswith=prefix, code__regex=rf"^{prefix}[0-9]+$")
+            .annotate(_n=Cast(Substr("code", len(prefix) + 1), IntegerField()))
+            .aggregate(m=Max("_n"))["m"]
+            or 0
         )
 
-        if last and last.code:
-            suffix = last.code.replace(prefix, "")
-            try:
-                number = int(suffix)
-            except ValueError:
-                number = 0
-        else:
-            number = 0
-
         return f"{prefix}{number + 1:0{pad}d}"
 
     def save(self, *args, **kwargs):
         # Only auto-generate if no code provided
-        if not self.code:
+        if self.code:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            _lock_code_prefix(self.CODE_PREFIX)
             self.code = self._generate_next_code()
-        super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
 
 
 class PackageItem(models.Model):
@@ -278,7 +332,12 @@ class PackageItem(models.Model):
     )
     quantity = models.PositiveIntegerField(default=1)
     unit_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
-    line_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # computed by the database (GENERATED ALWAYS AS ... STORED)
+    line_total = models.GeneratedField(
+        expression=F("unit_price") * F("quantity"),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
 
     class Meta:
         ordering = ("id",)
@@ -291,7 +350,6 @@ class PackageItem(models.Model):
         if (self.unit_price is None or self.unit_price == 0) and self.service:
             self.unit_price = self.service.base_price or 0
 
-        self.line_total = (self.unit_price or 0) * (self.quantity or 0)
         super().save(*args, **kwargs)
 
 
@@ -336,6 +394,10 @@ class InventoryItem(TimeStamped, Owned):
 
     class Meta:
         ordering = ("name",)
+        indexes = [
+            # inventory list: service + in/out of stock filters
+            models.Index(fields=["service", "quantity_available"]),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -0,0 +1,38 @@
+# services/signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Vendor, Service, Package, InventoryItem
+from .utils import bump_list_cache_version, invalidate_service_choices
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def clear_service_choices(sender, **kwargs):
+    """
+    The inventory list caches the service dropdown; drop it whenever a
+    service is added, renamed or removed (after commit, like the
+    catalog caches in sales/signals.py).
+    """
+    transaction.on_commit(invalidate_service_choices)
+
+
+@receiver(post_save, sender=Vendor)
+@receiver(post_delete, sender=Vendor)
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=Package)
+@receiver(post_delete, sender=Package)
+@receiver(post_save, sender=InventoryItem)
+@receiver(post_delete, sender=InventoryItem)
+def expire_list_fragments(sender, **kwargs):
+    """
+    Services list pages cache their table rows; start a new cache version
+    so the next render reflects the change. (Package totals change through
+    Package.recalculate_total(), which bumps the version itself.)
+    Bumped after commit so a render of the old rows can't land under the
+    new version.
+    """
+    transaction.on_commit(bump_list_cache_version)
@@ -1,32 +1,42 @@
 # services/urls.py
-from django.urls import path
+from django.urls import include, path
 
 from . import views
 
 app_name = "services"
 
+# One include per resource: the resolver matches the resource prefix once and
+# then only tries that resource's four routes, instead of all sixteen in turn.
 urlpatterns = [
     # Vendors
-    path("vendors/", views.VendorListView.as_view(), name="vendor_list"),
-    path("vendors/new/", views.VendorCreateView.as_view(), name="vendor_create"),
-    path("vendors/<int:pk>/", views.VendorDetailView.as_view(), name="vendor_detail"),
-    path("vendors/<int:pk>/edit/", views.VendorUpdateView.as_view(), name="vendor_update"),
+    path("vendors/", include([
+        path("", views.VendorListView.as_view(), name="vendor_list"),
+        path("new/", views.VendorCreateView.as_view(), name="vendor_create"),
+        path("<int:pk>/", views.VendorDetailView.as_view(), name="vendor_detail"),
+        path("<int:pk>/edit/", views.VendorUpdateView.as_view(), name="vendor_update"),
+    ])),
 
     # Services
-    path("services/", views.ServiceListView.as_view(), name="service_list"),
-    path("services/new/", views.ServiceCreateView.as_view(), name="service_create"),
-    path("services/<int:pk>/", views.ServiceDetailView.as_view(), name="service_detail"),
-    path("services/<int:pk>/edit/", views.ServiceUpdateView.as_view(), name="service_update"),
+    path("services/", include([
+        path("", views.ServiceListView.as_view(), name="service_list"),
+        path("new/", views.ServiceCreateView.as_view(), name="service_create"),
+        path("<int:pk>/", views.ServiceDetailView.as_view(), name="service_detail"),
+        path("<int:pk>/edit/", views.ServiceUpdateView.as_view(), name="service_update"),
+    ])),
 
     # Packages
-    path("packages/", views.PackageListView.as_view(), name="package_list"),
-    path("packages/new/", views.PackageCreateView.as_view(), name="package_create"),
-    path("packages/<int:pk>/", views.PackageDetailView.as_view(), name="package_detail"),
-    path("packages/<int:pk>/edit/", views.PackageUpdateView.as_view(), name="package_update"),
+    path("packages/", include([
+        path("", views.PackageListView.as_view(), name="package_list"),
+        path("new/", views.PackageCreateView.as_view(), name="package_create"),
+        path("<int:pk>/", views.PackageDetailView.as_view(), name="package_detail"),
+        path("<int:pk>/edit/", views.PackageUpdateView.as_view(), name="package_update"),
+    ])),
 
     # Inventory
-    path("inventory/", views.InventoryItemListView.as_view(), name="inventory_list"),
-    path("inventory/new/", views.InventoryItemCreateView.as_view(), name="inventory_create"),
-    path("inventory/<int:pk>/", views.InventoryItemDetailView.as_view(), name="inventory_detail"),
-    path("inventory/<int:pk>/edit/", views.InventoryItemUpdateView.as_view(), name="inventory_update"),
+    path("inventory/", include([
+        path("", views.InventoryItemListView.as_view(), name="inventory_list"),
+        path("new/", views.InventoryItemCreateView.as_view(), name="inventory_create"),
+        path("<int:pk>/", views.InventoryItemDetailView.as_view(), name="inventory_detail"),
+        path("<int:pk>/edit/", views.InventoryItemUpdateView.as_view(), name="inventory_update"),
+    ])),
 ]
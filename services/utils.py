@@ -0,0 +1,47 @@
+# services/utils.py
+from django.core.cache import cache
+
+from .models import Service
+
+# Service dropdown for the inventory list filter.
+# services/signals.py clears it on any Service change.
+SERVICE_CHOICES_CACHE_KEY = "services:service_choices:v1"
+SERVICE_CHOICES_CACHE_TIMEOUT = 5 * 60  # 5 minutes
+
+# The list templates cache their table rows ({% cache %}) keyed on this
+# version; services/signals.py bumps it on any catalog change.
+LIST_CACHE_VERSION_KEY = "services:list_cache_version"
+LIST_CACHE_TIMEOUT = 30  # seconds
+
+
+def _build_service_choices():
+    return list(Service.objects.order_by("name").values("id", "name"))
+
+
+def get_service_choices():
+    """
+    [{"id": ..., "name": ...}] for every service, ordered by name.
+    """
+    return cache.get_or_set(
+        SERVICE_CHOICES_CACHE_KEY, _build_service_choices, SERVICE_CHOICES_CACHE_TIMEOUT
+    )
+
+
+def invalidate_service_choices():
+    cache.delete(SERVICE_CHOICES_CACHE_KEY)
+
+
+def get_list_cache_version():
+    version = cache.get(LIST_CACHE_VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(LIST_CACHE_VERSION_KEY, version, None)
+    return version
+
+
+def bump_list_cache_version():
+    try:
+        cache.incr(LIST_CACHE_VERSION_KEY)
+    except ValueError:
+        # no version yet: nothing cached under the old one
+        cache.add(LIST_CACHE_VERSION_KEY, 2, None)
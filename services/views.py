@@ -1,5 +1,5 @@
 # services/views.py
-from django.db.models import Q
+from django.db import transaction
 from django.urls import reverse_lazy
 from django.views.generic import (
     ListView,
@@ -9,16 +9,20 @@ from django.views.generic import (
 )
 from django.shortcuts import redirect
 
-from common.mixins import AdminManagerMixin  # 👈 ensures only Admin/Manager can access
+from common.mixins import AdminManagerMixin, CachedSuccessUrlMixin  # 👈 ensures only Admin/Manager can access
+from common.paginators import EstimatingPaginator
+from common.utils import search_pks
 
 from .models import (
     Vendor,
     Service,
     Package,
     InventoryItem,
+    PackageItem,
     ServiceCategory,
     VendorType,
 )
+from .utils import LIST_CACHE_TIMEOUT, get_list_cache_version, get_service_choices
 from .forms import (
     VendorForm,
     ServiceForm,
@@ -28,26 +32,44 @@ from .forms import (
 )
 
 
+class ListRowsCacheMixin:
+    """
+    Context for the `{% cache %}` block around each services list table:
+    rows are rendered once per (cache version, role, URL) and the rows
+    query is skipped on a hit. Only the rows are cached - the page chrome
+    (user menu, notifications, CSRF token) is still rendered per request.
+    """
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["list_cache_version"] = get_list_cache_version()
+        context["list_cache_timeout"] = LIST_CACHE_TIMEOUT
+        return context
+
+
 # -------- Vendors -------- #
 
-class VendorListView(AdminManagerMixin, ListView):
+class VendorListView(AdminManagerMixin, ListRowsCacheMixin, ListView):
     model = Vendor
     template_name = "services/vendor_list.html"
     context_object_name = "vendors"
     paginate_by = 20
+    paginator_class = EstimatingPaginator
+
+    # Columns rendered by vendor_list.html; notes/address stay unloaded
+    LIST_FIELDS = (
+        "id", "name", "company_name", "vendor_type", "phone", "city", "is_preferred",
+    )
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = super().get_queryset().only(*self.LIST_FIELDS)
 
         q = self.request.GET.get("q", "").strip()
         vendor_type = self.request.GET.get("vendor_type", "").strip()
         preferred = self.request.GET.get("preferred", "").strip()
 
         if q:
-            qs = qs.filter(
-                Q(name__icontains=q) |
-                Q(company_name__icontains=q)
-            )
+            qs = qs.filter(pk__in=search_pks(Vendor, q, "name", "company_name"))
 
         if vendor_type:
             qs = qs.filter(vendor_type=vendor_type)
@@ -74,7 +96,7 @@ class VendorDetailView(AdminManagerMixin, DetailView):
     context_object_name = "vendor"
 
 
-class VendorCreateView(AdminManagerMixin, CreateView):
+class VendorCreateView(AdminManagerMixin, CachedSuccessUrlMixin, CreateView):
     model = Vendor
     form_class = VendorForm
     template_name = "services/vendor_form.html"
@@ -85,7 +107,7 @@ class VendorCreateView(AdminManagerMixin, CreateView):
         return super().form_valid(form)
 
 
-class VendorUpdateView(AdminManagerMixin, UpdateView):
+class VendorUpdateView(AdminManagerMixin, CachedSuccessUrlMixin, UpdateView):
     model = Vendor
     form_class = VendorForm
     template_name = "services/vendor_form.html"
@@ -94,24 +116,25 @@ class VendorUpdateView(AdminManagerMixin, UpdateView):
 
 # -------- Services -------- #
 
-class ServiceListView(AdminManagerMixin, ListView):
+class ServiceListView(AdminManagerMixin, ListRowsCacheMixin, ListView):
     model = Service
     template_name = "services/service_list.html"
     context_object_name = "services"
     paginate_by = 20
+    paginator_class = EstimatingPaginator
+
+    # Columns rendered by service_list.html (vendors are not listed)
+    LIST_FIELDS = ("id", "name", "code", "category", "base_price")
 
     def get_queryset(self):
-        qs = super().get_queryset().prefetch_related("vendors")
+        qs = super().get_queryset().only(*self.LIST_FIELDS)
 
         q = self.request.GET.get("q", "").strip()
         category = self.request.GET.get("category", "").strip()
         is_active = self.request.GET.get("is_active", "").strip()
 
         if q:
-            qs = qs.filter(
-                Q(name__icontains=q) |
-                Q(code__icontains=q)
-            )
+            qs = qs.filter(pk__in=search_pks(Service, q, "name", "code"))
 
         if category:
             qs = qs.filter(category=category)
@@ -138,7 +161,7 @@ class ServiceDetailView(AdminManagerMixin, DetailView):
     context_object_name = "service"
 
 
-class ServiceCreateView(AdminManagerMixin, CreateView):
+class ServiceCreateView(AdminManagerMixin, CachedSuccessUrlMixin, CreateView):
     model = Service
     form_class = ServiceForm
     template_name = "services/service_form.html"
@@ -149,7 +172,7 @@ class ServiceCreateView(AdminManagerMixin, CreateView):
         return super().form_valid(form)
 
 
-class ServiceUpdateView(AdminManagerMixin, UpdateView):
+class ServiceUpdateView(AdminManagerMixin, CachedSuccessUrlMixin, UpdateView):
     model = Service
     form_class = ServiceForm
     template_name = "services/service_form.html"
@@ -158,23 +181,57 @@ class ServiceUpdateView(AdminManagerMixin, UpdateView):
 
 # -------- Packages -------- #
 
-class PackageListView(AdminManagerMixin, ListView):
+def _save_package_items(package, items_formset):
+    """
+    Persist a validated PackageItemFormSet in a fixed number of queries:
+    one DELETE, one bulk INSERT, one bulk UPDATE and one UPDATE of the
+    package total, instead of a save() per row.
+    """
+    items_formset.instance = package
+    items_formset.save(commit=False)
+
+    deleted_ids = [obj.pk for obj in items_formset.deleted_objects]
+    if deleted_ids:
+        PackageItem.objects.filter(pk__in=deleted_ids).delete()
+
+    new_items = items_formset.new_objects
+    changed_items = [obj for obj, _fields in items_formset.changed_objects]
+
+    # Same default PackageItem.save() applies; line_total is generated by the DB
+    for obj in new_items + changed_items:
+        obj.package = package
+        if not obj.unit_price and obj.service:
+            obj.unit_price = obj.service.base_price or 0
+
+    if new_items:
+        PackageItem.objects.bulk_create(new_items)
+    if changed_items:
+        PackageItem.objects.bulk_update(
+            changed_items,
+            ["service", "description", "quantity", "unit_price"],
+        )
+
+    package.recalculate_total(refresh=False)
+
+
+class PackageListView(AdminManagerMixin, ListRowsCacheMixin, ListView):
     model = Package
     template_name = "services/package_list.html"
     context_object_name = "packages"
     paginate_by = 20
+    paginator_class = EstimatingPaginator
+
+    # Columns rendered by package_list.html
+    LIST_FIELDS = ("id", "name", "code", "total_price", "is_active")
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = super().get_queryset().only(*self.LIST_FIELDS)
 
         q = self.request.GET.get("q", "").strip()
         is_active = self.request.GET.get("is_active", "").strip()
 
         if q:
-            qs = qs.filter(
-                Q(name__icontains=q) |
-                Q(code__icontains=q)
-            )
+            qs = qs.filter(pk__in=search_pks(Package, q, "name", "code"))
 
         if is_active == "active":
             qs = qs.filter(is_active=True)
@@ -196,97 +253,95 @@ class PackageDetailView(AdminManagerMixin, DetailView):
     context_object_name = "package"
 
 
-class PackageCreateView(AdminManagerMixin, CreateView):
-    model = Package
-    form_class = PackageForm
-    template_name = "services/package_form.html"
-    success_url = reverse_lazy("services:package_list")
+class PackageItemsFormsetMixin:
+    """
+    Shared by PackageCreateView/PackageUpdateView. The items formset is
+    built once per request and reused by form_valid() and by the re-render
+    on errors, instead of being rebuilt from POST each time.
+    """
+
+    def get_items_formset(self):
+        if not hasattr(self, "_items_formset"):
+            if self.request.method == "POST":
+                self._items_formset = PackageItemFormSet(
+                    self.request.POST,
+                    instance=self.object,
+                    prefix="items",
+                )
+            else:
+                self._items_formset = PackageItemFormSet(
+                    instance=self.object,
+                    prefix="items",
+                )
+        return self._items_formset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        if self.request.POST:
-            context["items_formset"] = PackageItemFormSet(
-                self.request.POST,
-                prefix="items",
-            )
-        else:
-            context["items_formset"] = PackageItemFormSet(prefix="items")
+        context["items_formset"] = self.get_items_formset()
         return context
 
     def form_valid(self, form):
-        context = self.get_context_data()
-        items_formset = context["items_formset"]
+        items_formset = self.get_items_formset()
 
         form.instance.owner = self.request.user
 
         if items_formset.is_valid():
-            self.object = form.save()
-            items_formset.instance = self.object
-            items_formset.save()
-            self.object.recalculate_total()
+            # Package + items + total commit together (or not at all)
+            with transaction.atomic():
+                self.object = form.save()
+                _save_package_items(self.object, items_formset)
             return redirect(self.get_success_url())
 
         # if formset invalid, re-render with errors
         return self.render_to_response(self.get_context_data(form=form))
 
 
-class PackageUpdateView(AdminManagerMixin, UpdateView):
+class PackageCreateView(
+    AdminManagerMixin, CachedSuccessUrlMixin, PackageItemsFormsetMixin, CreateView
+):
     model = Package
     form_class = PackageForm
     template_name = "services/package_form.html"
     success_url = reverse_lazy("services:package_list")
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        if self.request.POST:
-            context["items_formset"] = PackageItemFormSet(
-                self.request.POST,
-                instance=self.object,
-                prefix="items",
-            )
-        else:
-            context["items_formset"] = PackageItemFormSet(
-                instance=self.object,
-                prefix="items",
-            )
-        return context
-
-    def form_valid(self, form):
-        context = self.get_context_data()
-        items_formset = context["items_formset"]
-
-        form.instance.owner = self.request.user
-
-        if items_formset.is_valid():
-            self.object = form.save()
-            items_formset.instance = self.object
-            items_formset.save()
-            self.object.recalculate_total()
-            return redirect(self.get_success_url())
 
-        return self.render_to_response(self.get_context_data(form=form))
+class PackageUpdateView(
+    AdminManagerMixin, CachedSuccessUrlMixin, PackageItemsFormsetMixin, UpdateView
+):
+    model = Package
+    form_class = PackageForm
+    template_name = "services/package_form.html"
+    success_url = reverse_lazy("services:package_list")
 
 
 # -------- Inventory Items -------- #
 
-class InventoryItemListView(AdminManagerMixin, ListView):
+class InventoryItemListView(AdminManagerMixin, ListRowsCacheMixin, ListView):
     model = InventoryItem
     template_name = "services/inventory_list.html"
     context_object_name = "inventory_items"
     paginate_by = 20
+    paginator_class = EstimatingPaginator
+
+    # Columns rendered by inventory_list.html
+    LIST_FIELDS = (
+        "id", "name", "sku", "quantity_total", "quantity_available", "unit",
+        "location", "service", "service__id", "service__name",
+    )
 
     def get_queryset(self):
-        qs = super().get_queryset().select_related("service")
+        qs = (
+            super().get_queryset()
+            .select_related("service")
+            .only(*self.LIST_FIELDS)
+        )
 
         q = self.request.GET.get("q", "").strip()
         service_id = self.request.GET.get("service", "").strip()
         stock_status = self.request.GET.get("stock_status", "").strip()
 
         if q:
-            qs = qs.filter(
-                Q(name__icontains=q) |
-                Q(sku__icontains=q)
-            )
+            qs = qs.filter(pk__in=search_pks(InventoryItem, q, "name", "sku"))
 
         if service_id:
             qs = qs.filter(service_id=service_id)
@@ -303,7 +358,7 @@ class InventoryItemListView(AdminManagerMixin, ListView):
         context["q"] = self.request.GET.get("q", "").strip()
         context["service_filter"] = self.request.GET.get("service", "").strip()
         context["stock_status"] = self.request.GET.get("stock_status", "").strip()
-        context["service_choices"] = Service.objects.order_by("name")
+        context["service_choices"] = get_service_choices()
         return context
 
 
@@ -313,7 +368,7 @@ class InventoryItemDetailView(AdminManagerMixin, DetailView):
     context_object_name = "inventory_item"
 
 
-class InventoryItemCreateView(AdminManagerMixin, CreateView):
+class InventoryItemCreateView(AdminManagerMixin, CachedSuccessUrlMixin, CreateView):
     model = InventoryItem
     form_class = InventoryItemForm
     template_name = "services/inventory_form.html"
@@ -324,7 +379,7 @@ class InventoryItemCreateView(AdminManagerMixin, CreateView):
         return super().form_valid(form)
 
 
-class InventoryItemUpdateView(AdminManagerMixin, UpdateView):
+class InventoryItemUpdateView(AdminManagerMixin, CachedSuccessUrlMixin, UpdateView):
     model = InventoryItem
     form_class = InventoryItemForm
     template_name = "services/inventory_form.html"
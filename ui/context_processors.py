@@ -1,7 +1,12 @@
 # ui/context_processors.py
 from django.conf import settings
 
+# APP_VERSION is fixed for the life of the process, so build the context once.
+# Django copies processor output into the template context, so sharing the
+# dict across requests is safe.
+_APP_VERSION_CONTEXT = {
+    "APP_VERSION": getattr(settings, "APP_VERSION", "dev")
+}
+
 def app_version(request):
-    return {
-        "APP_VERSION": getattr(settings, "APP_VERSION", "dev")
-    }
+    return _APP_VERSION_CONTEXT
@@ -1,36 +1,10 @@
 from django import forms
 from django.contrib.auth import get_user_model
 
-User = get_user_model()
-
-class BootstrapModelForm(forms.ModelForm):
-    """
-    Base form to automatically add Bootstrap classes to widgets.
-    - Text / number / email / URL / textarea / date => form-control
-    - Select / ModelChoiceField => form-select
-    - Checkbox => form-check-input
-    """
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        for name, field in self.fields.items():
-            widget = field.widget
+from common.forms import BootstrapModelForm
 
-            # Keep any existing classes
-            existing_classes = widget.attrs.get("class", "")
-
-            # Checkbox
-            if isinstance(widget, forms.CheckboxInput):
-                widget.attrs["class"] = (existing_classes + " form-check-input").strip()
-
-            # Selects (ChoiceField, ModelChoiceField, etc.)
-            elif isinstance(widget, (forms.Select, forms.SelectMultiple)):
-                widget.attrs["class"] = (existing_classes + " form-select").strip()
+User = get_user_model()
 
-            # Everything else → form-control
-            else:
-                widget.attrs["class"] = (existing_classes + " form-control").strip()
 
 class ProfileUpdateForm(BootstrapModelForm):
     class Meta:
@@ -0,0 +1,17 @@
+# ui/middleware.py
+from django.utils import timezone
+
+
+class TodayMiddleware:
+    """
+    Sets request.today: the local date (per TIME_ZONE / the active time
+    zone) when the request came in. Views use it instead of asking for
+    the time again, and tests can pin it by setting request.today.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.today = timezone.localdate()
+        return self.get_response(request)
@@ -1,6 +1,8 @@
 # ui/templatetags/user_groups.py
 from django import template
 
+from common.roles import user_roles
+
 register = template.Library()
 
 @register.filter
@@ -9,6 +11,6 @@ def has_group(user, group_name):
     Usage in template:
         {% if user|has_group:"Admin" %}
     """
-    if not user.is_authenticated:
-        return False
-    return user.groups.filter(name=group_name).exists()
+    # Same cached lookup as the views (common.roles.user_roles), so a
+    # request runs at most one groups query. Superusers hold every role.
+    return group_name in user_roles(user)
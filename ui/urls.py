@@ -6,6 +6,7 @@ app_name = "ui"
 
 urlpatterns = [
     path("", views.home, name="home"),
+    path("home/<slug:part>/", views.home_part, name="home_part"),
     path("login/", views.login_view, name="login"),
     path("logout/", views.logout_view, name="logout"),
     path("profile/", views.ProfileDetailView.as_view(), name="profile"),
@@ -1,15 +1,23 @@
 # ui/views.py
+from dataclasses import dataclass
+from datetime import datetime, time
+from types import MappingProxyType
+from typing import Callable, Optional
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F, Func, IntegerField, Q, Subquery, Value, Window
+from django.db.models.functions import Coalesce, NullIf, RowNumber
+from django.http import Http404
 from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 
-from django.contrib.auth.models import Group
+from common.roles import ROLE_ADMIN, ROLE_MANAGER, ROLE_EMPLOYEE, user_roles
 
-from common.roles import user_has_role, ROLE_ADMIN, ROLE_MANAGER, ROLE_EMPLOYEE
-
-from crm.models import Client, Lead, Inquiry
-from sales.models import Deal
+from common.models import MonthlyMetric
+from crm.models import Client, Inquiry
 from projects.models import (
     Project,
     Task,
@@ -24,30 +32,275 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import PasswordChangeView
 from django.urls import reverse_lazy
+from django.views.decorators.http import require_http_methods
 from django.views.generic import TemplateView, UpdateView
 
 from .forms import ProfileUpdateForm
 
 User = get_user_model()
 
+DASHBOARD_CACHE_TIMEOUT = 30  # seconds
+
+# Message tag the login page uses to pick out login/logout messages
+AUTH_SCOPE = "scope:auth"
 
-def _get_month_info():
+def _get_month_info(today):
     """
-    Returns:
-      this_year, this_month, prev_year, prev_month
+    Returns half-open [start, end) bounds for the month of the local date
+    `today` and the previous one, as aware datetimes at local midnight:
+      cur_start, cur_end, prev_start, prev_end
+    Range filters on these let the database use a plain index on the date
+    column, unlike __year/__month lookups.
     """
-    today = timezone.now().date()
-    this_year = today.year
-    this_month = today.month
-
-    if this_month == 1:
-        prev_year = this_year - 1
-        prev_month = 12
+    cur_month = today.replace(day=1)
+    if cur_month.month == 12:
+        next_month = cur_month.replace(year=cur_month.year + 1, month=1)
+    else:
+        next_month = cur_month.replace(month=cur_month.month + 1)
+    if cur_month.month == 1:
+        prev_month = cur_month.replace(year=cur_month.year - 1, month=12)
     else:
-        prev_year = this_year
-        prev_month = this_month - 1
+        prev_month = cur_month.replace(month=cur_month.month - 1)
+
+    def start_of(day):
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    return start_of(cur_month), start_of(next_month), start_of(prev_month), start_of(cur_month)
+
+
+def _month_pair_filters(field, months):
+    """
+    (this month, previous month) Q filters on datetime `field`.
+    `months` is the tuple returned by _get_month_info().
+    """
+    cur_start, cur_end, prev_start, prev_end = months
+    return (
+        Q(**{f"{field}__gte": cur_start, f"{field}__lt": cur_end}),
+        Q(**{f"{field}__gte": prev_start, f"{field}__lt": prev_end}),
+    )
+
+
+def _count_of(qs):
+    """Scalar subquery: the number of rows in `qs`."""
+    return Coalesce(
+        Subquery(
+            qs.order_by().annotate(n=Func(F("pk"), function="COUNT")).values("n"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def _fetch_scalars(user, **subqueries):
+    """
+    Evaluates several scalar subqueries in a single SELECT (one round trip)
+    and returns them as a dict. The user's own row anchors the SELECT so
+    exactly one row comes back.
+    """
+    return User.objects.filter(pk=user.pk).values(**subqueries).get()
+
+
+# MonthlyMetric model name behind each "total ..." card
+_CREATED_METRIC_MODELS = {
+    "total_leads": "crm.lead",
+    "total_clients": "crm.client",
+    "total_deals": "sales.deal",
+}
+
+
+def _created_month_subqueries(months, owner=None):
+    """
+    Scalar subqueries for this and the previous month's creation counts of
+    leads, clients and deals ("total_leads_count", "total_leads_prev_count",
+    ...), summed from the MonthlyMetric counters instead of counting the
+    three tables. With `owner`, only that user's records.
+    """
+    cur_start, _cur_end, prev_start, _prev_end = months
+    metrics = MonthlyMetric.objects.all()
+    if owner is not None:
+        metrics = metrics.filter(owner=owner)
+
+    def total(name, month_start):
+        rows = metrics.filter(
+            model_name=name, year=month_start.year, month=month_start.month,
+        )
+        return Coalesce(
+            Subquery(
+                rows.order_by().annotate(t=Func(F("count"), function="SUM")).values("t"),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+
+    subqueries = {}
+    for key, name in _CREATED_METRIC_MODELS.items():
+        subqueries[f"{key}_count"] = total(name, cur_start)
+        subqueries[f"{key}_prev_count"] = total(name, prev_start)
+    return subqueries
+
 
-    return this_year, this_month, prev_year, prev_month
+# Columns the home.html tables render (plus pk); loading only these keeps
+# text/notes columns of the listed rows and their relations off the wire.
+_PROJECT_LIST_FIELDS = (
+    "name", "due_date", "status",
+    "client__name", "client__display_name",
+    "manager__username",
+)
+_TEAM_ITEM_LIST_FIELDS = (
+    "name", "due_date", "status", "project__name", "assigned_to__username",
+)
+_MY_ITEM_LIST_FIELDS = ("name", "due_date", "status", "project__name")
+
+
+# Ordering and size of the dashboard top-10 lists
+_PROJECT_LIST_ORDER = ("due_date", "name")
+_TASK_LIST_ORDER = ("due_date", "priority")
+_DELIVERABLE_LIST_ORDER = ("due_date", "name")
+_PENDING_LIST_SIZE = 10
+
+
+def _pending_list_rows(qs, kind, order, rel_name, user_name):
+    """
+    One UNION ALL part for _pending_lists(): the first rows of `qs` as
+    (kind, pos, pk, name, due_date, status, rel_name, user_name).
+    """
+    return (
+        qs.annotate(
+            kind=Value(kind),
+            pos=Window(RowNumber(), order_by=[F(f).asc() for f in order]),
+            row_pk=F("pk"),
+            row_name=F("name"),
+            row_due=F("due_date"),
+            row_status=F("status"),
+            rel_name=rel_name,
+            user_name=user_name,
+        )
+        .order_by(*order)
+        .values_list(
+            "kind", "pos", "row_pk", "row_name", "row_due", "row_status",
+            "rel_name", "user_name",
+        )[:_PENDING_LIST_SIZE]
+    )
+
+
+def _pending_lists(projects, tasks, deliverables):
+    """
+    (projects, tasks, deliverables) top-10 lists for the admin/manager
+    dashboard, from the filtered querysets passed in.
+
+    Where the database allows ORDER BY/LIMIT inside UNION ALL (PostgreSQL)
+    the three lists come back in one round trip as flat rows, rebuilt into
+    display-only instances that carry just what home.html renders (they
+    are never saved). Elsewhere it's one query per list.
+    """
+    if not connection.features.supports_slicing_ordering_in_compound:
+        return (
+            list(
+                projects.select_related("client", "manager")
+                .only(*_PROJECT_LIST_FIELDS)
+                .order_by(*_PROJECT_LIST_ORDER)[:_PENDING_LIST_SIZE]
+            ),
+            list(
+                tasks.select_related("project", "assigned_to")
+                .only(*_TEAM_ITEM_LIST_FIELDS)
+                .order_by(*_TASK_LIST_ORDER)[:_PENDING_LIST_SIZE]
+            ),
+            list(
+                deliverables.select_related("project", "assigned_to")
+                .only(*_TEAM_ITEM_LIST_FIELDS)
+                .order_by(*_DELIVERABLE_LIST_ORDER)[:_PENDING_LIST_SIZE]
+            ),
+        )
+
+    rows = _pending_list_rows(
+        projects, "project", _PROJECT_LIST_ORDER,
+        # Client.__str__: display name, else name
+        rel_name=Coalesce(NullIf("client__display_name", Value("")), "client__name"),
+        user_name=F("manager__username"),
+    ).union(
+        _pending_list_rows(
+            tasks, "task", _TASK_LIST_ORDER,
+            rel_name=F("project__name"), user_name=F("assigned_to__username"),
+        ),
+        _pending_list_rows(
+            deliverables, "deliverable", _DELIVERABLE_LIST_ORDER,
+            rel_name=F("project__name"), user_name=F("assigned_to__username"),
+        ),
+        all=True,
+    )
+
+    lists = {"project": [], "task": [], "deliverable": []}
+    for kind, pos, pk, name, due_date, status, rel_name, user_name in rows:
+        if kind == "project":
+            obj = Project(pk=pk, name=name, due_date=due_date, status=status)
+            obj.client = Client(name=rel_name or "")
+            obj.manager = User(username=user_name) if user_name else None
+        else:
+            model = Task if kind == "task" else Deliverable
+            obj = model(pk=pk, name=name, due_date=due_date, status=status)
+            obj.project = Project(name=rel_name or "")
+            obj.assigned_to = User(username=user_name) if user_name else None
+        lists[kind].append((pos, obj))
+
+    return tuple(
+        [obj for _pos, obj in sorted(lists[kind], key=lambda item: item[0])]
+        for kind in ("project", "task", "deliverable")
+    )
+
+
+# Every key home.html reads, with the value shown when the user's role
+# doesn't compute it.
+_DASHBOARD_DEFAULTS = MappingProxyType({
+    # Admin/Manager counts (row 1)
+    "pending_projects_count": 0,
+    "pending_tasks_count": 0,
+    "pending_deliverables_count": 0,
+
+    # Admin/Manager monthly totals (row 2)
+    "total_leads_count": 0,
+    "total_clients_count": 0,
+    "total_deals_count": 0,
+    "total_leads_prev_count": 0,
+    "total_clients_prev_count": 0,
+    "total_deals_prev_count": 0,
+    "total_leads_pct_change": 0,
+    "total_clients_pct_change": 0,
+    "total_deals_pct_change": 0,
+
+    # Employee counts (row 1)
+    "my_pending_tasks_count": 0,
+    "my_pending_deliverables_count": 0,
+    "my_inquiries_count": 0,  # open/in-progress
+
+    # Employee monthly totals (row 2)
+    "my_completed_tasks_count": 0,
+    "my_completed_deliverables_count": 0,
+    "my_total_inquiries_count": 0,
+    "my_completed_tasks_prev_count": 0,
+    "my_completed_deliverables_prev_count": 0,
+    "my_total_inquiries_prev_count": 0,
+    "my_completed_tasks_pct_change": 0,
+    "my_completed_deliverables_pct_change": 0,
+    "my_total_inquiries_pct_change": 0,
+
+    # Lists
+    "pending_projects_list": None,
+    "pending_tasks_list": None,
+    "pending_deliverables_list": None,
+    "my_pending_tasks_list": None,
+    "my_pending_deliverables_list": None,
+})
+
+
+def _add_pct_changes(context, *names):
+    """
+    Sets context["<name>_pct_change"] from "<name>_count" and
+    "<name>_prev_count" for each name.
+    """
+    for name in names:
+        context[f"{name}_pct_change"] = _pct_change(
+            context[f"{name}_count"], context[f"{name}_prev_count"]
+        )
 
 
 def _pct_change(current: int, prev: int) -> int:
@@ -63,382 +316,269 @@ def _pct_change(current: int, prev: int) -> int:
     return round((current - prev) * 100 / prev)
 
 
-@login_required
-def home(request):
-    user = request.user
-
-    # ---- Roles ----
-    is_admin = user_has_role(user, ROLE_ADMIN)
-    is_manager = user_has_role(user, ROLE_MANAGER)
-    is_employee = user_has_role(user, ROLE_EMPLOYEE)
-
-    if is_admin:
-        role_label = "Admin"
-    elif is_manager:
-        role_label = "Manager"
-    elif is_employee:
-        role_label = "Employee"
-    else:
-        role_label = "User"
-
-    # Month info for comparisons
-    this_year, this_month, prev_year, prev_month = _get_month_info()
-
-    # ------------------------------------------------------------------
-    # Default values (to avoid missing keys in context)
-    # ------------------------------------------------------------------
-    pending_projects_count = 0
-    pending_tasks_count = 0
-    pending_deliverables_count = 0
-
-    # Row 2 (admin/manager) monthly totals + previous month + pct change
-    total_leads_count = 0
-    total_clients_count = 0
-    total_deals_count = 0
-
-    total_leads_prev_count = 0
-    total_clients_prev_count = 0
-    total_deals_prev_count = 0
-
-    total_leads_pct_change = 0
-    total_clients_pct_change = 0
-    total_deals_pct_change = 0
-
-    # Employee counts
-    my_pending_tasks_count = 0
-    my_pending_deliverables_count = 0
-    my_inquiries_count = 0  # open/in-progress
-
-    # Employee row 2 monthly totals + previous + pct
-    my_completed_tasks_count = 0
-    my_completed_deliverables_count = 0
-    my_total_inquiries_count = 0
-
-    my_completed_tasks_prev_count = 0
-    my_completed_deliverables_prev_count = 0
-    my_total_inquiries_prev_count = 0
-
-    my_completed_tasks_pct_change = 0
-    my_completed_deliverables_pct_change = 0
-    my_total_inquiries_pct_change = 0
-
-    pending_projects_list = None
-    pending_tasks_list = None
-    pending_deliverables_list = None
-
-    my_pending_tasks_list = None
-    my_pending_deliverables_list = None
-
-    # ------------------------------------------------------------------
-    # ADMIN
-    # ------------------------------------------------------------------
-    if is_admin:
-        # Row 1: global current pending counts (no month comparison)
-        pending_projects_count = Project.objects.exclude(
-            status__in=[ProjectStatus.COMPLETED, ProjectStatus.CANCELLED]
-        ).count()
-
-        pending_tasks_count = Task.objects.filter(
-            status=TaskStatus.PENDING
-        ).count()
-
-        pending_deliverables_count = Deliverable.objects.filter(
-            status=DeliverableStatus.PENDING
-        ).count()
-
-        # Row 2: monthly totals for all leads/clients/deals
-        leads_qs = Lead.objects.all()
-        clients_qs = Client.objects.all()
-        deals_qs = Deal.objects.all()
-
-        total_leads_count = leads_qs.filter(
-            created_at__year=this_year, created_at__month=this_month
-        ).count()
-        total_leads_prev_count = leads_qs.filter(
-            created_at__year=prev_year, created_at__month=prev_month
-        ).count()
-        total_leads_pct_change = _pct_change(total_leads_count, total_leads_prev_count)
-
-        total_clients_count = clients_qs.filter(
-            created_at__year=this_year, created_at__month=this_month
-        ).count()
-        total_clients_prev_count = clients_qs.filter(
-            created_at__year=prev_year, created_at__month=prev_month
-        ).count()
-        total_clients_pct_change = _pct_change(
-            total_clients_count, total_clients_prev_count
-        )
+# Status groups and filters shared by the dashboards (built once at import;
+# only the user restriction is added per request)
+_FINISHED_PROJECT_STATUSES = (ProjectStatus.COMPLETED, ProjectStatus.CANCELLED)
+_ACTIVE_TASK_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS)
+_ACTIVE_DELIV_STATUSES = (DeliverableStatus.PENDING, DeliverableStatus.IN_PROGRESS)
+_OPEN_INQUIRY_STATUSES = ("open", "in_progress")
 
-        total_deals_count = deals_qs.filter(
-            created_at__year=this_year, created_at__month=this_month
-        ).count()
-        total_deals_prev_count = deals_qs.filter(
-            created_at__year=prev_year, created_at__month=prev_month
-        ).count()
-        total_deals_pct_change = _pct_change(total_deals_count, total_deals_prev_count)
-
-        # Lists: global scope
-        pending_projects_list = (
-            Project.objects
-            .exclude(status__in=[ProjectStatus.COMPLETED, ProjectStatus.CANCELLED])
-            .select_related("client", "manager")
-            .order_by("due_date", "name")[:10]
-        )
+_OPEN_PROJECTS_Q = ~Q(status__in=_FINISHED_PROJECT_STATUSES)
+_PENDING_TASKS_Q = Q(status=TaskStatus.PENDING)
+_PENDING_DELIVERABLES_Q = Q(status=DeliverableStatus.PENDING)
+_OPEN_TASKS_Q = Q(status__in=_ACTIVE_TASK_STATUSES)
+_OPEN_DELIVERABLES_Q = Q(status__in=_ACTIVE_DELIV_STATUSES)
+_COMPLETED_TASKS_Q = Q(status=TaskStatus.COMPLETED)
+_DELIVERED_Q = Q(status=DeliverableStatus.DELIVERED)
+_OPEN_INQUIRIES_Q = Q(status__in=_OPEN_INQUIRY_STATUSES)
 
-        pending_tasks_list = (
-            Task.objects
-            .filter(status__in=[TaskStatus.PENDING, TaskStatus.IN_PROGRESS])
-            .select_related("project", "assigned_to")
-            .order_by("due_date", "priority")[:10]
-        )
 
-        pending_deliverables_list = (
-            Deliverable.objects
-            .filter(status__in=[DeliverableStatus.PENDING, DeliverableStatus.IN_PROGRESS])
-            .select_related("project", "assigned_to")
-            .order_by("due_date", "name")[:10]
-        )
+@dataclass(frozen=True)
+class RoleSpec:
+    """
+    How the dashboard is built for one role.
 
-    # ------------------------------------------------------------------
-    # MANAGER
-    # ------------------------------------------------------------------
-    elif is_manager:
-        # Row 1: manager's current pending counts
-        pending_projects_count = Project.objects.filter(
-            manager=user
-        ).exclude(
-            status__in=[ProjectStatus.COMPLETED, ProjectStatus.CANCELLED]
-        ).count()
-
-        pending_tasks_count = Task.objects.filter(
-            project__manager=user,
-            status=TaskStatus.PENDING,
-        ).count()
-
-        pending_deliverables_count = Deliverable.objects.filter(
-            project__manager=user,
-            status=DeliverableStatus.PENDING,
-        ).count()
-
-        # Row 2: manager's monthly totals via Owned.owner
-        leads_qs = Lead.objects.filter(owner=user)
-        clients_qs = Client.objects.filter(owner=user)
-        deals_qs = Deal.objects.filter(owner=user)
-
-        total_leads_count = leads_qs.filter(
-            created_at__year=this_year, created_at__month=this_month
-        ).count()
-        total_leads_prev_count = leads_qs.filter(
-            created_at__year=prev_year, created_at__month=prev_month
-        ).count()
-        total_leads_pct_change = _pct_change(total_leads_count, total_leads_prev_count)
-
-        total_clients_count = clients_qs.filter(
-            created_at__year=this_year, created_at__month=this_month
-        ).count()
-        total_clients_prev_count = clients_qs.filter(
-            created_at__year=prev_year, created_at__month=prev_month
-        ).count()
-        total_clients_pct_change = _pct_change(
-            total_clients_count, total_clients_prev_count
-        )
+    `stats(spec, user, months)` and `lists(spec, user, months)` return the
+    role's context keys for the KPI rows and the top-10 lists (see
+    _DASHBOARD_PARTS). The lookups tie rows to the user (None = no
+    restriction): the project lookup applies to projects, the item lookup
+    to tasks/deliverables.
+    """
+    label: str
+    stats: Callable
+    lists: Callable
+    project_user_lookup: Optional[str] = None
+    item_user_lookup: Optional[str] = None
+    metrics_by_owner: bool = False
 
-        total_deals_count = deals_qs.filter(
-            created_at__year=this_year, created_at__month=this_month
-        ).count()
-        total_deals_prev_count = deals_qs.filter(
-            created_at__year=prev_year, created_at__month=prev_month
-        ).count()
-        total_deals_pct_change = _pct_change(total_deals_count, total_deals_prev_count)
-
-        # Lists: scoped to manager's projects
-        pending_projects_list = (
-            Project.objects
-            .filter(manager=user)
-            .exclude(status__in=[ProjectStatus.COMPLETED, ProjectStatus.CANCELLED])
-            .select_related("client", "manager")
-            .order_by("due_date", "name")[:10]
-        )
+    def scoped(self, qs, lookup, user):
+        if lookup is None:
+            return qs
+        return qs.filter(**{lookup: user})
 
-        pending_tasks_list = (
-            Task.objects
-            .filter(
-                project__manager=user,
-                status__in=[TaskStatus.PENDING, TaskStatus.IN_PROGRESS],
-            )
-            .select_related("project", "assigned_to")
-            .order_by("due_date", "priority")[:10]
-        )
 
-        pending_deliverables_list = (
-            Deliverable.objects
-            .filter(
-                project__manager=user,
-                status__in=[DeliverableStatus.PENDING, DeliverableStatus.IN_PROGRESS],
-            )
-            .select_related("project", "assigned_to")
-            .order_by("due_date", "name")[:10]
-        )
+def _team_scope(spec, user):
+    """(projects, tasks, deliverables) visible on an admin/manager dashboard."""
+    return (
+        spec.scoped(Project.objects.all(), spec.project_user_lookup, user),
+        spec.scoped(Task.objects.all(), spec.item_user_lookup, user),
+        spec.scoped(Deliverable.objects.all(), spec.item_user_lookup, user),
+    )
 
-    # ------------------------------------------------------------------
-    # EMPLOYEE
-    # ------------------------------------------------------------------
-    elif is_employee:
-        # Row 1: current pending
-        my_pending_tasks_count = Task.objects.filter(
-            status=TaskStatus.PENDING,
-            assigned_to=user,
-        ).count()
-
-        my_pending_deliverables_count = Deliverable.objects.filter(
-            status=DeliverableStatus.PENDING,
-            assigned_to=user,
-        ).count()
-
-        my_inquiries_count = Inquiry.objects.filter(
-            handled_by=user,
-            status__in=["open", "in_progress"],
-        ).count()
-
-        # Row 2: monthly completed + inquiries handled (this month vs prev)
-        completed_tasks_qs = Task.objects.filter(
-            status=TaskStatus.COMPLETED,
-            assigned_to=user,
-        )
-        delivered_qs = Deliverable.objects.filter(
-            status=DeliverableStatus.DELIVERED,
-            assigned_to=user,
-        )
-        handled_inquiries_qs = Inquiry.objects.filter(handled_by=user)
-
-        my_completed_tasks_count = completed_tasks_qs.filter(
-            updated_at__year=this_year, updated_at__month=this_month
-        ).count()
-        my_completed_tasks_prev_count = completed_tasks_qs.filter(
-            updated_at__year=prev_year, updated_at__month=prev_month
-        ).count()
-        my_completed_tasks_pct_change = _pct_change(
-            my_completed_tasks_count, my_completed_tasks_prev_count
-        )
 
-        my_completed_deliverables_count = delivered_qs.filter(
-            updated_at__year=this_year, updated_at__month=this_month
-        ).count()
-        my_completed_deliverables_prev_count = delivered_qs.filter(
-            updated_at__year=prev_year, updated_at__month=prev_month
-        ).count()
-        my_completed_deliverables_pct_change = _pct_change(
-            my_completed_deliverables_count, my_completed_deliverables_prev_count
-        )
+def _team_stats(spec, user, months):
+    """
+    Admin/manager KPI rows: pending counts and monthly lead/client/deal
+    totals, scoped by `spec`.
+    """
+    projects, tasks, deliverables = _team_scope(spec, user)
+
+    # Row 1 (current pending counts, no month comparison) and row 2
+    # (monthly lead/client/deal totals via Owned.owner) in one SELECT
+    context = _fetch_scalars(
+        user,
+        pending_projects_count=_count_of(projects.filter(_OPEN_PROJECTS_Q)),
+        pending_tasks_count=_count_of(tasks.filter(_PENDING_TASKS_Q)),
+        pending_deliverables_count=_count_of(deliverables.filter(_PENDING_DELIVERABLES_Q)),
+        **_created_month_subqueries(
+            months, owner=user if spec.metrics_by_owner else None,
+        ),
+    )
+
+    _add_pct_changes(context, "total_leads", "total_clients", "total_deals")
+    return context
+
+
+def _team_lists(spec, user, months):
+    """Admin/manager top-10 project, task and deliverable lists."""
+    projects, tasks, deliverables = _team_scope(spec, user)
+    (
+        pending_projects_list,
+        pending_tasks_list,
+        pending_deliverables_list,
+    ) = _pending_lists(
+        projects.filter(_OPEN_PROJECTS_Q),
+        tasks.filter(_OPEN_TASKS_Q),
+        deliverables.filter(_OPEN_DELIVERABLES_Q),
+    )
+    return {
+        "pending_projects_list": pending_projects_list,
+        "pending_tasks_list": pending_tasks_list,
+        "pending_deliverables_list": pending_deliverables_list,
+    }
 
-        my_total_inquiries_count = handled_inquiries_qs.filter(
-            updated_at__year=this_year, updated_at__month=this_month
-        ).count()
-        my_total_inquiries_prev_count = handled_inquiries_qs.filter(
-            updated_at__year=prev_year, updated_at__month=prev_month
-        ).count()
-        my_total_inquiries_pct_change = _pct_change(
-            my_total_inquiries_count, my_total_inquiries_prev_count
-        )
 
-        # Row 3: lists (only own items)
-        my_pending_tasks_list = (
-            Task.objects
-            .filter(
-                status__in=[TaskStatus.PENDING, TaskStatus.IN_PROGRESS],
-                assigned_to=user,
-            )
+def _employee_stats(spec, user, months):
+    """
+    Employee KPI rows: own pending work and monthly completions.
+    """
+    tasks = spec.scoped(Task.objects.all(), spec.item_user_lookup, user)
+    deliverables = spec.scoped(Deliverable.objects.all(), spec.item_user_lookup, user)
+    inquiries = Inquiry.objects.filter(handled_by=user)
+
+    # Rows 1 and 2: current pending and this/previous month's completions,
+    # all in one SELECT
+    cur_q, prev_q = _month_pair_filters("updated_at", months)
+    completed_tasks = tasks.filter(_COMPLETED_TASKS_Q)
+    delivered = deliverables.filter(_DELIVERED_Q)
+    context = _fetch_scalars(
+        user,
+        my_pending_tasks_count=_count_of(tasks.filter(_PENDING_TASKS_Q)),
+        my_pending_deliverables_count=_count_of(deliverables.filter(_PENDING_DELIVERABLES_Q)),
+        my_inquiries_count=_count_of(inquiries.filter(_OPEN_INQUIRIES_Q)),
+        my_completed_tasks_count=_count_of(completed_tasks.filter(cur_q)),
+        my_completed_tasks_prev_count=_count_of(completed_tasks.filter(prev_q)),
+        my_completed_deliverables_count=_count_of(delivered.filter(cur_q)),
+        my_completed_deliverables_prev_count=_count_of(delivered.filter(prev_q)),
+        my_total_inquiries_count=_count_of(inquiries.filter(cur_q)),
+        my_total_inquiries_prev_count=_count_of(inquiries.filter(prev_q)),
+    )
+    _add_pct_changes(
+        context,
+        "my_completed_tasks", "my_completed_deliverables", "my_total_inquiries",
+    )
+    return context
+
+
+def _employee_lists(spec, user, months):
+    """Employee top-10 lists (only own items)."""
+    tasks = spec.scoped(Task.objects.all(), spec.item_user_lookup, user)
+    deliverables = spec.scoped(Deliverable.objects.all(), spec.item_user_lookup, user)
+    return {
+        "my_pending_tasks_list": list(
+            tasks.filter(_OPEN_TASKS_Q)
             .select_related("project")
-            .order_by("due_date", "priority")[:10]
-        )
-
-        my_pending_deliverables_list = (
-            Deliverable.objects
-            .filter(
-                status__in=[DeliverableStatus.PENDING, DeliverableStatus.IN_PROGRESS],
-                assigned_to=user,
-            )
+            .only(*_MY_ITEM_LIST_FIELDS)
+            .order_by(*_TASK_LIST_ORDER)[:_PENDING_LIST_SIZE]
+        ),
+        "my_pending_deliverables_list": list(
+            deliverables.filter(_OPEN_DELIVERABLES_Q)
             .select_related("project")
-            .order_by("due_date", "name")[:10]
-        )
+            .only(*_MY_ITEM_LIST_FIELDS)
+            .order_by(*_DELIVERABLE_LIST_ORDER)[:_PENDING_LIST_SIZE]
+        ),
+    }
 
-    # ------------------------------------------------------------------
-    # Fallback (user without any role)
-    # ------------------------------------------------------------------
-    else:
-        pass
-
-    context = {
-        "role_label": role_label,
-        "is_admin": is_admin,
-        "is_manager": is_manager,
-        "is_employee": is_employee,
-
-        # Admin/Manager counts (row 1)
-        "pending_projects_count": pending_projects_count,
-        "pending_tasks_count": pending_tasks_count,
-        "pending_deliverables_count": pending_deliverables_count,
-
-        # Admin/Manager monthly totals (row 2)
-        "total_leads_count": total_leads_count,
-        "total_clients_count": total_clients_count,
-        "total_deals_count": total_deals_count,
-        "total_leads_prev_count": total_leads_prev_count,
-        "total_clients_prev_count": total_clients_prev_count,
-        "total_deals_prev_count": total_deals_prev_count,
-        "total_leads_pct_change": total_leads_pct_change,
-        "total_clients_pct_change": total_clients_pct_change,
-        "total_deals_pct_change": total_deals_pct_change,
-
-        # Employee counts (row 1)
-        "my_pending_tasks_count": my_pending_tasks_count,
-        "my_pending_deliverables_count": my_pending_deliverables_count,
-        "my_inquiries_count": my_inquiries_count,
-
-        # Employee monthly totals (row 2)
-        "my_completed_tasks_count": my_completed_tasks_count,
-        "my_completed_deliverables_count": my_completed_deliverables_count,
-        "my_total_inquiries_count": my_total_inquiries_count,
-        "my_completed_tasks_prev_count": my_completed_tasks_prev_count,
-        "my_completed_deliverables_prev_count": my_completed_deliverables_prev_count,
-        "my_total_inquiries_prev_count": my_total_inquiries_prev_count,
-        "my_completed_tasks_pct_change": my_completed_tasks_pct_change,
-        "my_completed_deliverables_pct_change": my_completed_deliverables_pct_change,
-        "my_total_inquiries_pct_change": my_total_inquiries_pct_change,
-
-        # Lists
-        "pending_projects_list": pending_projects_list,
-        "pending_tasks_list": pending_tasks_list,
-        "pending_deliverables_list": pending_deliverables_list,
-        "my_pending_tasks_list": my_pending_tasks_list,
-        "my_pending_deliverables_list": my_pending_deliverables_list,
+
+# Dashboard per role, in precedence order: a user in several groups gets
+# the first matching one.
+ROLE_SPECS = {
+    ROLE_ADMIN: RoleSpec(label="Admin", stats=_team_stats, lists=_team_lists),
+    ROLE_MANAGER: RoleSpec(
+        label="Manager",
+        stats=_team_stats,
+        lists=_team_lists,
+        project_user_lookup="manager",
+        item_user_lookup="project__manager",
+        metrics_by_owner=True,
+    ),
+    ROLE_EMPLOYEE: RoleSpec(
+        label="Employee",
+        stats=_employee_stats,
+        lists=_employee_lists,
+        item_user_lookup="assigned_to",
+    ),
+}
+
+
+# Sections of the home page that are loaded separately by home_part():
+# name -> (fragment template, RoleSpec attribute computing its keys)
+_DASHBOARD_PARTS = {
+    "stats": ("ui/partials/home_stats.html", "stats"),
+    "lists": ("ui/partials/home_lists.html", "lists"),
+}
+
+
+def _compute_dashboard_context(user, spec, part, today):
+    """
+    Role-specific numbers or lists for one dashboard part. Everything in
+    the returned dict is already evaluated (lists are materialized), so it
+    can be cached and rendered without further queries. Users without a
+    role (spec None) get the defaults only.
+    """
+    if spec is None:
+        return dict(_DASHBOARD_DEFAULTS)
+    compute = getattr(spec, _DASHBOARD_PARTS[part][1])
+    return {**_DASHBOARD_DEFAULTS, **compute(spec, user, _get_month_info(today))}
+
+
+def _role_context(user):
+    """
+    (spec, context) for the signed-in user: the RoleSpec of their
+    dashboard (None without a role) and the role flags templates use.
+    """
+    # One groups query for all three roles, cached on the user
+    roles = user_roles(user)
+    spec = next((ROLE_SPECS[r] for r in ROLE_SPECS if r in roles), None)
+    return spec, {
+        "role_label": spec.label if spec else "User",
+        "is_admin": ROLE_ADMIN in roles,
+        "is_manager": ROLE_MANAGER in roles,
+        "is_employee": ROLE_EMPLOYEE in roles,
     }
 
+
+@login_required
+def home(request):
+    """
+    Dashboard shell: role flags and placeholders only. The numbers and
+    lists are fetched from home_part() once the page has painted.
+    """
+    _spec, context = _role_context(request.user)
     return render(request, "ui/home.html", context)
 
 
+@login_required
+@require_http_methods(["GET"])
+def home_part(request, part):
+    """
+    One dashboard section (see _DASHBOARD_PARTS) as an HTML fragment.
+    """
+    if part not in _DASHBOARD_PARTS:
+        raise Http404("Unknown dashboard section.")
+    user = request.user
+    spec, context = _role_context(user)
 
+    # Dashboards tolerate a little staleness: reuse the computed numbers
+    # for the same user/role within a DASHBOARD_CACHE_TIMEOUT window.
+    bucket = int(timezone.now().timestamp() // DASHBOARD_CACHE_TIMEOUT)
+    cache_key = f"dash:{user.pk}:{context['role_label'].lower()}:{part}:{bucket}"
+    dashboard = cache.get(cache_key)
+    if dashboard is None:
+        # request.today is set by ui.middleware.TodayMiddleware
+        today = getattr(request, "today", None) or timezone.localdate()
+        dashboard = _compute_dashboard_context(user, spec, part, today)
+        cache.set(cache_key, dashboard, DASHBOARD_CACHE_TIMEOUT)
+
+    context.update(dashboard)
+    return render(request, _DASHBOARD_PARTS[part][0], context)
+
+
+@require_http_methods(["GET", "POST"])
 def login_view(request):
-    if request.method == "POST":
-        username = request.POST.get("username")
-        password = request.POST.get("password")
+    if request.method == "GET":
+        return render(request, "ui/login.html")
 
-        user = authenticate(request, username=username, password=password)
+    username = request.POST.get("username", "")
+    password = request.POST.get("password", "")
 
-        if user is not None:
-            login(request, user)
-            messages.success(request, "Welcome back!" ,extra_tags="scope:auth")
-            return redirect("ui:home")  # redirect to dashboard/home
+    # Blank fields can't match an account; don't spend a password hash on them
+    user = None
+    if username and password:
+        user = authenticate(request, username=username, password=password)
 
-        else:
-            messages.error(request, "Invalid username or password", extra_tags="scope:auth")
+    if user is not None:
+        login(request, user)
+        messages.success(request, "Welcome back!", extra_tags=AUTH_SCOPE)
+        return redirect("ui:home")  # redirect to dashboard/home
 
+    messages.error(request, "Invalid username or password", extra_tags=AUTH_SCOPE)
     return render(request, "ui/login.html")
 
 
 def logout_view(request):
     logout(request)
-    messages.info(request, "You have been logged out.", extra_tags="scope:auth")
+    messages.info(request, "You have been logged out.", extra_tags=AUTH_SCOPE)
     return redirect("ui:login")
 
 